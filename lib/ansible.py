@@ -1,117 +1,258 @@
 """Ansible wrapper."""
 
+import json
 import os
+import re
 import shutil
 import subprocess
+import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence
 
-from .config import get_root_dir, get_deployment_dir, read_tfvars
+from .config import get_root_dir, get_deployment_dir, get_tfvars_path, read_tfvars
+from .inventory import materialize_inventory
 
+# Deployment config fields passed to playbooks as extra vars
+_FEATURE_FLAGS = (
+    "enable_autocoder",
+    "enable_gastown",
+    "enable_beads",
+    "enable_k9s",
+    "enable_systemd_services",
+    "enable_glm",
+    "enable_letsencrypt",
+    "domain_name",
+    "zai_key",
+)
 
+# Of those, the secrets; validation runs without them, as it always has
+_SECRET_FLAGS = frozenset({"zai_key"})
+
+# A feature enabled in terraform.tfvars. Without one, domain_name and zai_key
+# are unused by the playbooks; enable_firewall is handled by terraform.
+_ENABLED_FEATURE_RE = re.compile(rb"^\s*enable_(?!firewall\b)\w+\s*=\s*true\b", re.M)
+
+# Lines of ansible output shown in the condensed (non-verbose) view
+_PROGRESS_RE = re.compile(rb"^(TASK|PLAY|failed:|fatal:)")
+
+
+@lru_cache(maxsize=1)
 def find_ansible_cmd() -> Optional[str]:
-    """Find ansible-playbook command."""
-    if shutil.which("ansible-playbook"):
-        return "ansible-playbook"
-    return None
+    """Find ansible-playbook command.
 
+    Returns the resolved path so each run execs it without another PATH search.
+    """
+    return shutil.which("ansible-playbook")
 
+
+@lru_cache(maxsize=None)
 def get_ansible_dir() -> Path:
     """Get the ansible directory."""
     return get_root_dir() / "ansible"
 
 
-def run_playbook(name: str) -> bool:
-    """Run ansible playbook for a deployment."""
+@lru_cache(maxsize=1)
+def _get_ansible_env() -> Dict[str, str]:
+    """Get the base environment shared by every ansible-playbook run.
+
+    Enables SSH pipelining, a higher fork count and smart fact gathering
+    with a jsonfile cache, so repeat runs of playbook, update and validate
+    skip redundant setup work. Built once per process; do not mutate.
+    """
+    env = {
+        **os.environ,
+        # Disable host key checking for ephemeral infrastructure
+        "ANSIBLE_HOST_KEY_CHECKING": "False",
+        "ANSIBLE_PIPELINING": "True",
+        "ANSIBLE_SSH_PIPELINING": "True",
+        "ANSIBLE_FORKS": "10",
+        "ANSIBLE_GATHERING": "smart",
+        "ANSIBLE_CACHE_PLUGIN": "jsonfile",
+    }
+
+    # Per-task timing is only useful when debugging slow runs
+    if os.environ.get("ROUGHNECK_DEBUG"):
+        env["ANSIBLE_CALLBACKS_ENABLED"] = "profile_tasks"
+
+    return env
+
+
+def _build_ansible_env(deploy_dir: Path) -> Dict[str, str]:
+    """Build the environment for an ansible-playbook run on a deployment."""
+    facts_dir = deploy_dir / ".facts"
+    facts_dir.mkdir(parents=True, exist_ok=True)
+    return {**_get_ansible_env(), "ANSIBLE_CACHE_PLUGIN_CONNECTION": str(facts_dir)}
+
+
+def _fmt(value) -> str:
+    """Format a tfvars value the way ansible's bool filter expects."""
+    return "true" if value is True else "false" if value is False else str(value)
+
+
+def _feature_flag_vars(name: str, include_secrets: bool = True) -> Dict[str, str]:
+    """Collect the feature flags from a deployment's tfvars as extra vars."""
+    # Cheap probe so minimal deployments skip parsing the tfvars entirely
+    try:
+        with open(get_tfvars_path(name), "rb") as f:
+            if not _ENABLED_FEATURE_RE.search(f.read()):
+                return {}
+    except OSError:
+        return {}
+
+    cfg = read_tfvars(name)
+    if not cfg:
+        return {}
+
+    # Only pass truthy values
+    return {
+        flag: _fmt(value)
+        for flag in _FEATURE_FLAGS
+        if (value := getattr(cfg, flag))
+        and (include_secrets or flag not in _SECRET_FLAGS)
+    }
+
+
+def _write_extra_vars(deploy_dir: Path, extra_vars: Dict[str, str]) -> Path:
+    """Write extra vars to a JSON file for ansible's --extra-vars @file.
+
+    One file keeps the command line short and makes the invocation easy to
+    reproduce by hand when debugging a deployment.
+    """
+    vars_path = deploy_dir / "extra_vars.json"
+    with open(vars_path, "w") as f:
+        json.dump(extra_vars, f, indent=2)
+    return vars_path
+
+
+def _copy_raw(stream) -> None:
+    """Copy the rest of a child's output to our stdout in large chunks."""
+    sys.stdout.flush()
+    out = sys.stdout.buffer
+    while chunk := stream.read1(65536):
+        out.write(chunk)  # Unlike os.write(), never stops short
+        out.flush()
+
+
+def _stream_progress(process: subprocess.Popen) -> None:
+    """Condense ansible output to task progress, failures and the play recap.
+
+    On a terminal the current task name is rewritten in place; elsewhere
+    each task is printed on its own line.
+    """
+    interactive = sys.stdout.isatty()
+    status_shown = False
+    in_recap = False
+
+    def clear_status() -> None:
+        nonlocal status_shown
+        if status_shown:
+            sys.stdout.write("\r\033[K")
+            status_shown = False
+
+    for raw in process.stdout:
+        line = raw.decode("utf-8", "replace").rstrip()
+        if in_recap:
+            # Everything after the recap header is shown as-is
+            print(line)
+            _copy_raw(process.stdout)
+            break
+
+        match = _PROGRESS_RE.match(raw)
+        if not match:
+            continue
+
+        kind = match.group(1)
+        if kind == b"TASK":
+            task = line[line.find("[") + 1 : line.rfind("]")]
+            if interactive:
+                sys.stdout.write(f"\r\033[K  → {task}")
+                sys.stdout.flush()
+                status_shown = True
+            else:
+                print(f"  → {task}")
+        elif kind == b"PLAY":
+            clear_status()
+            print(line.rstrip("* "))
+            in_recap = line.startswith("PLAY RECAP")
+        else:
+            clear_status()
+            print(line)
+
+    clear_status()
+    sys.stdout.flush()
+
+
+def _run_ansible(
+    playbook: str,
+    name: str,
+    extra_args: Sequence[str] = (),
+    include_flags: bool = True,
+    extra_vars: Optional[Dict[str, str]] = None,
+    include_secrets: bool = True,
+) -> bool:
+    """Run an ansible playbook against a deployment's inventory."""
     cmd = find_ansible_cmd()
     if not cmd:
         return False
 
     deploy_dir = get_deployment_dir(name)
-    inventory_path = deploy_dir / "inventory.ini"
-    if not inventory_path.exists():
+    inventory_path = materialize_inventory(name)
+    if inventory_path is None:
         return False
 
-    # Read feature flags from tfvars
-    cfg = read_tfvars(name)
+    all_vars = dict(extra_vars or {})
+    if include_flags:
+        all_vars.update(_feature_flag_vars(name, include_secrets))
 
-    # Disable host key checking for ephemeral infrastructure
-    env = os.environ.copy()
-    env["ANSIBLE_HOST_KEY_CHECKING"] = "False"
+    vars_args = []
+    if all_vars:
+        vars_args = ["--extra-vars", f"@{_write_extra_vars(deploy_dir, all_vars)}"]
 
-    # Build extra vars from deployment config
-    extra_vars = [
-        "-e",
-        f"local_deployment_dir={deploy_dir}",
+    # ROUGHNECK_VERBOSE adds -v and passes ansible's full output straight through
+    verbose = bool(os.environ.get("ROUGHNECK_VERBOSE"))
+    args = [
+        cmd,
+        "-i",
+        str(inventory_path),
+        *(["-v"] if verbose else []),
+        *extra_args,
+        *vars_args,
+        playbook,
     ]
+    env = _build_ansible_env(deploy_dir)
 
-    # Pass feature flags to ansible
-    if cfg:
-        feature_flags = [
-            ("enable_autocoder", cfg.enable_autocoder),
-            ("enable_gastown", cfg.enable_gastown),
-            ("enable_beads", cfg.enable_beads),
-            ("enable_k9s", cfg.enable_k9s),
-            ("enable_systemd_services", cfg.enable_systemd_services),
-            ("enable_glm", cfg.enable_glm),
-            ("enable_letsencrypt", cfg.enable_letsencrypt),
-            ("domain_name", cfg.domain_name),
-            ("zai_key", cfg.zai_key),
-        ]
-        for flag_name, flag_value in feature_flags:
-            if flag_value:  # Only pass truthy values
-                extra_vars.extend(
-                    [
-                        "-e",
-                        f"{flag_name}={str(flag_value).lower() if isinstance(flag_value, bool) else flag_value}",
-                    ]
-                )
-
-    result = subprocess.run(
-        [
-            cmd,
-            "-i",
-            str(inventory_path),
-            "-v",
-            *extra_vars,
-            "playbook.yml",
-        ],
+    if verbose:
+        result = subprocess.run(args, cwd=get_ansible_dir(), env=env)
+        return result.returncode == 0
+
+    # stderr stays attached to the terminal so ansible errors are never filtered
+    process = subprocess.Popen(
+        args,
         cwd=get_ansible_dir(),
         env=env,
+        stdout=subprocess.PIPE,
     )
-    return result.returncode == 0
+    try:
+        _stream_progress(process)
+    finally:
+        process.stdout.close()
+    return process.wait() == 0
 
 
-def run_update_playbook(name: str, tags: List[str]) -> bool:
-    """Run the update playbook with specified tags."""
-    cmd = find_ansible_cmd()
-    if not cmd:
-        return False
-
+def run_playbook(name: str) -> bool:
+    """Run ansible playbook for a deployment."""
     deploy_dir = get_deployment_dir(name)
-    inventory_path = deploy_dir / "inventory.ini"
-    if not inventory_path.exists():
-        return False
+    return _run_ansible(
+        "playbook.yml", name, extra_vars={"local_deployment_dir": str(deploy_dir)}
+    )
 
-    # Disable host key checking for ephemeral infrastructure
-    env = os.environ.copy()
-    env["ANSIBLE_HOST_KEY_CHECKING"] = "False"
-
-    tags_arg = ",".join(tags)
-    result = subprocess.run(
-        [
-            cmd,
-            "-i",
-            str(inventory_path),
-            "-v",
-            "--tags",
-            tags_arg,
-            "update.yml",
-        ],
-        cwd=get_ansible_dir(),
-        env=env,
+
+def run_update_playbook(name: str, tags: List[str]) -> bool:
+    """Run the update playbook with specified tags."""
+    return _run_ansible(
+        "update.yml", name, extra_args=("--tags", ",".join(tags)), include_flags=False
     )
-    return result.returncode == 0
 
 
 def run_validate(name: str) -> bool:
@@ -119,56 +260,5 @@ def run_validate(name: str) -> bool:
 
     Returns True if all validations pass, False otherwise.
     """
-    cmd = find_ansible_cmd()
-    if not cmd:
-        return False
-
-    deploy_dir = get_deployment_dir(name)
-    inventory_path = deploy_dir / "inventory.ini"
-    if not inventory_path.exists():
-        return False
-
-    # Read feature flags from tfvars
-    cfg = read_tfvars(name)
-
-    # Disable host key checking for ephemeral infrastructure
-    env = os.environ.copy()
-    env["ANSIBLE_HOST_KEY_CHECKING"] = "False"
-
-    # Build extra vars from deployment config
-    extra_vars = []
-
-    # Pass feature flags to ansible
-    if cfg:
-        feature_flags = [
-            ("enable_autocoder", cfg.enable_autocoder),
-            ("enable_gastown", cfg.enable_gastown),
-            ("enable_beads", cfg.enable_beads),
-            ("enable_k9s", cfg.enable_k9s),
-            ("enable_systemd_services", cfg.enable_systemd_services),
-            ("enable_glm", cfg.enable_glm),
-            ("enable_letsencrypt", cfg.enable_letsencrypt),
-            ("domain_name", cfg.domain_name),
-        ]
-        for flag_name, flag_value in feature_flags:
-            if flag_value:  # Only pass truthy values
-                value = (
-                    str(flag_value).lower()
-                    if isinstance(flag_value, bool)
-                    else flag_value
-                )
-                extra_vars.extend(["-e", f"{flag_name}={value}"])
-
-    result = subprocess.run(
-        [
-            cmd,
-            "-i",
-            str(inventory_path),
-            "-v",
-            *extra_vars,
-            "validate.yml",
-        ],
-        cwd=get_ansible_dir(),
-        env=env,
-    )
-    return result.returncode == 0
+    # Validation only checks what's installed; keep secrets out of extra_vars.json
+    return _run_ansible("validate.yml", name, include_secrets=False)
@@ -14,7 +14,6 @@ from .commands import (
     update,
     validate,
 )
-from .menu import interactive_menu
 
 app = typer.Typer(
     name="roughneck",
@@ -45,4 +44,6 @@ app.command("creds", hidden=True)(credentials_cmd)
 def main(ctx: typer.Context) -> None:
     """Show interactive menu if no command is provided."""
     if ctx.invoked_subcommand is None:
+        from .menu import interactive_menu
+
         interactive_menu()
@@ -5,23 +5,28 @@ from typing import Annotated, Optional
 import typer
 
 from .. import output, prompts
-from ... import ansible, config, ssh, terraform
+from ... import config
 from .helpers import (
+    DeploymentContext,
     check_prerequisites,
     get_deployment_name,
     handle_recovery_action,
     open_editor,
     recovery_menu,
     run_stage,
+    set_verbose,
 )
-from .providers import prompt_new_config
 
 
 def do_deploy(name: str) -> int:
     """Run terraform and ansible for a deployment with recovery support."""
+    from ... import ansible, ssh
+
+    ctx = DeploymentContext(name)
+
     # Smart resume: check what's already done
-    ip = config.get_deployment_ip(name)
-    if ip and ssh.is_reachable(ip):
+    ip = ctx.ip
+    if ctx.reachable:
         output.info(f"Server {ip} already running, skipping to configuration...")
         stages = ["ansible"]
     elif ip:
@@ -43,18 +48,20 @@ def do_deploy(name: str) -> int:
         if result.success:
             if stage == "apply":
                 output.success("Infrastructure provisioned")
+                ctx.refresh()
 
                 # DNS pause for Let's Encrypt
-                ip = config.get_deployment_ip(name)
-                cfg = config.read_tfvars(name)
+                ip = ctx.ip
+                cfg = ctx.cfg
                 if cfg and cfg.enable_letsencrypt and cfg.domain_name and ip:
                     output.header("DNS Configuration Required")
-                    output.console.print(f"  Server IP: [cyan]{ip}[/cyan]")
-                    output.console.print(f"  Domain:    [cyan]{cfg.domain_name}[/cyan]")
-                    output.console.print()
-                    output.console.print("  Configure your DNS:")
-                    output.console.print(f"    {cfg.domain_name}  →  A record  →  {ip}")
-                    output.console.print()
+                    output.console.print(
+                        f"  Server IP: [cyan]{ip}[/cyan]\n"
+                        f"  Domain:    [cyan]{cfg.domain_name}[/cyan]\n"
+                        "\n"
+                        "  Configure your DNS:\n"
+                        f"    {cfg.domain_name}  →  A record  →  {ip}\n"
+                    )
                     if not prompts.confirm("DNS configured and propagated?"):
                         output.info(
                             "Deployment paused. Run './roughneck deploy' to resume."
@@ -68,50 +75,54 @@ def do_deploy(name: str) -> int:
         else:
             last_error = result.error
             output.error(f"{stage.title()} failed")
-            action = recovery_menu(stage, name, error=last_error)
+            action, error_info = recovery_menu(stage, name, error=last_error)
 
             if action == "retry":
                 continue
             elif action == "reselect":
                 # Handle server type reselection, then retry regardless of result
-                handle_recovery_action(action, name, error=last_error)
+                handle_recovery_action(action, name, error_info)
+                ctx.refresh()
                 continue
             elif action == "edit":
                 tfvars_path = config.get_tfvars_path(name)
                 open_editor(tfvars_path)
+                config.invalidate(name)
+                ctx.refresh()
                 continue
             elif action == "skip":
+                # A failed apply may still have created the server
+                ctx.refresh()
                 stage_idx += 1
             else:
                 output.info("Deployment paused. Run './roughneck deploy' to resume.")
                 return 1
 
     # Done
-    ip = config.get_deployment_ip(name)
-    deploy_dir = config.get_deployment_dir(name)
-    summary_file = deploy_dir / "installation-summary.txt"
-    cfg = config.read_tfvars(name)
+    ip = ctx.ip
+    cfg = ctx.cfg
+    summary_file = ctx.deploy_dir / "installation-summary.txt"
 
     output.header("Deployment Complete")
+    lines = []
     ssh_cmd = ssh.get_ssh_command(name)
     if ssh_cmd:
-        output.console.print(f"  SSH:         [cyan]{ssh_cmd}[/cyan]")
+        lines.append(f"  SSH:         [cyan]{ssh_cmd}[/cyan]")
     if cfg and cfg.enable_letsencrypt and cfg.domain_name:
-        output.console.print(
+        lines.append(
             f"  Code-server: [cyan]https://{cfg.domain_name}[/cyan]  (Let's Encrypt)"
         )
     elif ip:
-        output.console.print(
+        lines.append(
             f"  Code-server: [cyan]https://{ip}:10000[/cyan]  (self-signed cert)"
         )
     if cfg and cfg.enable_autocoder and ip:
-        output.console.print(
-            f"  AutoCoder:   [cyan]http://{ip}:10001[/cyan]  (basic auth)"
-        )
-    output.console.print()
+        lines.append(f"  AutoCoder:   [cyan]http://{ip}:10001[/cyan]  (basic auth)")
+    lines.append("")
     if summary_file.exists():
-        output.console.print(f"  Full details: {summary_file}")
-    output.console.print()
+        lines.append(f"  Full details: {summary_file}")
+    lines.append("")
+    output.console.print("\n".join(lines))
 
     # Run validation
     output.header("Validating Deployment")
@@ -128,8 +139,14 @@ def do_deploy(name: str) -> int:
 def new(
     name: Annotated[Optional[str], typer.Argument(help="Deployment name")] = None,
     json_output: Annotated[bool, typer.Option("--json", help="Output JSON")] = False,
+    verbose: Annotated[
+        bool, typer.Option("--verbose", "-v", help="Show full ansible output")
+    ] = False,
 ) -> None:
     """Create a new deployment."""
+    from .providers import prompt_new_config
+
+    set_verbose(verbose)
     if not check_prerequisites():
         raise typer.Exit(1)
 
@@ -184,8 +201,12 @@ def new(
 
 def deploy(
     name: Annotated[Optional[str], typer.Argument(help="Deployment name")] = None,
+    verbose: Annotated[
+        bool, typer.Option("--verbose", "-v", help="Show full ansible output")
+    ] = False,
 ) -> None:
     """Deploy an existing deployment."""
+    set_verbose(verbose)
     if not check_prerequisites():
         raise typer.Exit(1)
 
@@ -207,6 +228,8 @@ def destroy(
     ] = False,
 ) -> None:
     """Destroy a deployment."""
+    from ... import terraform
+
     if not check_prerequisites():
         raise typer.Exit(1)
 
@@ -219,11 +242,13 @@ def destroy(
     output.header(f"Destroy: {name}")
     ip = config.get_deployment_ip(name)
     provider = config.get_deployment_provider(name)
+    lines = []
     if provider:
-        output.console.print(f"  Provider:  {provider}")
+        lines.append(f"  Provider:  {provider}")
     if ip:
-        output.console.print(f"  Server IP: {ip}")
-    output.console.print()
+        lines.append(f"  Server IP: {ip}")
+    lines.append("")
+    output.console.print("\n".join(lines))
 
     output.warning("This will permanently destroy all infrastructure!")
 
@@ -256,19 +281,8 @@ def list_deployments(
             output.info("Create one with: ./roughneck new")
             return
 
-    # Build deployment data once
-    data = []
-    for name in deployments:
-        ip = config.get_deployment_ip(name)
-        provider = config.get_deployment_provider(name) or "unknown"
-        data.append(
-            {
-                "name": name,
-                "provider": provider,
-                "ip": ip,
-                "status": "deployed" if ip else "configured",
-            }
-        )
+    status = config.load_all_deployment_status()
+    data = [{"name": name, **status[name]} for name in deployments]
 
     if json_output:
         output.print_json(data)
@@ -1,29 +1,43 @@
 """Credentials management command."""
 
+from typing import Final
+
 import typer
+from rich.text import Text
 
 from .. import output, prompts
 from ... import credentials
 
+_AGE_INSTALL_HELP: Final = Text.from_markup(
+    """\
+  Credential storage uses age encryption.
+  Install age to enable this feature:
+
+  [bold]macOS:[/bold]
+    brew install age
+
+  [bold]Linux (Debian/Ubuntu):[/bold]
+    sudo apt install age
+
+  [bold]Linux (Fedora):[/bold]
+    sudo dnf install age
+
+  Or download from: https://github.com/FiloSottile/age/releases
+"""
+)
+
+_CRED_MENU: Final = (
+    ("add", "Add new credentials"),
+    ("remove", "Remove credentials"),
+    ("back", "Back to main menu"),
+)
+
 
 def credentials_cmd() -> None:
     """Manage stored credentials."""
     if not credentials.is_available():
         output.header("age Installation Required")
-        output.console.print("  Credential storage uses age encryption.")
-        output.console.print("  Install age to enable this feature:")
-        output.console.print()
-        output.console.print("  [bold]macOS:[/bold]")
-        output.console.print("    brew install age")
-        output.console.print()
-        output.console.print("  [bold]Linux (Debian/Ubuntu):[/bold]")
-        output.console.print("    sudo apt install age")
-        output.console.print()
-        output.console.print("  [bold]Linux (Fedora):[/bold]")
-        output.console.print("    sudo dnf install age")
-        output.console.print()
-        output.console.print("  Or download from: https://github.com/FiloSottile/age/releases")
-        output.console.print()
+        output.console.print(_AGE_INSTALL_HELP)
         raise typer.Exit(1)
 
     while True:
@@ -33,14 +47,7 @@ def credentials_cmd() -> None:
         output.print_credentials([{"name": c.name, "provider": c.provider} for c in creds])
         output.console.print()
 
-        action = prompts.select(
-            "Action:",
-            [
-                ("add", "Add new credentials"),
-                ("remove", "Remove credentials"),
-                ("back", "Back to main menu"),
-            ],
-        )
+        action = prompts.select("Action:", _CRED_MENU)
 
         if action == "back" or action is None:
             return
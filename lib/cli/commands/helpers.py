@@ -4,13 +4,19 @@ import os
 import re
 import subprocess
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from functools import cached_property, lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
 
 import typer
 
 from .. import output, prompts
-from ... import ansible, config, ssh, terraform
-from ...providers import hetzner
+from ... import config
+
+# Hetzner: Server Type "cpx31" is unavailable in "hel1"
+_SERVER_TYPE_UNAVAILABLE_RE = re.compile(
+    r'Server Type "([^"]+)" is unavailable in "([^"]+)"'
+)
 
 
 @dataclass
@@ -21,8 +27,46 @@ class StageResult:
     error: str = ""
 
 
-def check_prerequisites() -> bool:
-    """Check that required tools are installed."""
+@dataclass
+class DeploymentContext:
+    """Deployment details looked up once while a deploy runs.
+
+    Call refresh() after anything that changes the config or the server
+    (editing tfvars, terraform apply).
+    """
+
+    name: str
+
+    @cached_property
+    def cfg(self) -> Optional[config.DeploymentConfig]:
+        return config.read_tfvars(self.name)
+
+    @cached_property
+    def ip(self) -> Optional[str]:
+        return config.get_deployment_ip(self.name)
+
+    @cached_property
+    def reachable(self) -> bool:
+        """Whether the server accepts TCP connections on the SSH port."""
+        from ... import ssh
+
+        return bool(self.ip) and ssh.is_port_open(self.ip)
+
+    @cached_property
+    def deploy_dir(self) -> Path:
+        return config.get_deployment_dir(self.name)
+
+    def refresh(self) -> None:
+        """Forget the cached config, IP and reachability."""
+        for attr in ("cfg", "ip", "reachable"):
+            self.__dict__.pop(attr, None)
+
+
+@lru_cache(maxsize=1)
+def _missing_prerequisites() -> Tuple[str, ...]:
+    """Names of the required tools that are not installed, probed once per process."""
+    from ... import ansible, terraform
+
     missing = []
 
     if not terraform.find_terraform_cmd():
@@ -31,19 +75,31 @@ def check_prerequisites() -> bool:
     if not ansible.find_ansible_cmd():
         missing.append("ansible-playbook")
 
+    return tuple(missing)
+
+
+def check_prerequisites() -> bool:
+    """Check that required tools are installed."""
+    missing = _missing_prerequisites()
     if missing:
         output.error(f"Missing required tools: {', '.join(missing)}")
         return False
     return True
 
 
+def set_verbose(verbose: bool) -> None:
+    """Enable full ansible output for this process (see ansible._run_ansible)."""
+    if verbose:
+        os.environ["ROUGHNECK_VERBOSE"] = "1"
+
+
 def open_editor(filepath: str) -> bool:
     """Open a file in the user's editor."""
-    editor = os.environ.get("EDITOR", os.environ.get("VISUAL", "nano"))
+    editor = os.environ.get("EDITOR") or os.environ.get("VISUAL") or "nano"
     try:
         result = subprocess.run([editor, filepath])
         return result.returncode == 0
-    except (OSError, FileNotFoundError):
+    except OSError:  # includes FileNotFoundError
         output.error(f"Could not open editor: {editor}")
         output.info(f"Set $EDITOR environment variable or edit manually: {filepath}")
         return False
@@ -76,7 +132,8 @@ def get_deployment_name(
     deployments = config.list_deployments()
 
     if require_ip:
-        deployments = [d for d in deployments if config.get_deployment_ip(d)]
+        ips = config.load_all_deployment_ips()
+        deployments = [d for d in deployments if ips[d]]
 
     if not deployments:
         if allow_empty:
@@ -99,8 +156,7 @@ def detect_server_type_error(error: str) -> Optional[Tuple[str, str]]:
 
     Returns (server_type, location) if detected, None otherwise.
     """
-    # Hetzner: Server Type "cpx31" is unavailable in "hel1"
-    match = re.search(r'Server Type "([^"]+)" is unavailable in "([^"]+)"', error)
+    match = _SERVER_TYPE_UNAVAILABLE_RE.search(error)
     if match:
         return match.group(1), match.group(2)
     return None
@@ -108,6 +164,9 @@ def detect_server_type_error(error: str) -> Optional[Tuple[str, str]]:
 
 def reselect_server_type(name: str, current_type: str, location: str) -> bool:
     """Let user select a different server type for the location."""
+    from ...providers import hetzner
+    from ...providers._cache import HETZNER_SERVER_TYPE_CATALOG, cached_catalog
+
     cfg = config.read_tfvars(name)
     if not cfg:
         output.error("Could not read deployment config")
@@ -125,7 +184,11 @@ def reselect_server_type(name: str, current_type: str, location: str) -> bool:
 
     output.info(f"Fetching available server types for {location}...")
     try:
-        server_types = hetzner.get_server_types(token, location)
+        # Same cached catalog setup used, filtered for the failed location
+        catalog = cached_catalog(
+            HETZNER_SERVER_TYPE_CATALOG, hetzner.fetch_server_types, token
+        )
+        server_types = hetzner.filter_server_types(catalog, location)
         if not server_types:
             output.error(f"No server types available in {location}")
             return False
@@ -150,46 +213,64 @@ def reselect_server_type(name: str, current_type: str, location: str) -> bool:
         return False
 
 
-def recovery_menu(stage: str, name: str, error: str = "") -> str:
+_RETRY = ("retry", "Retry")
+_RESELECT = ("reselect", "Select different server type")
+_EDIT = ("edit", "Edit configuration")
+_SKIP = ("skip", "Skip to next step")
+_ABORT = ("abort", "Abort (keep current state)")
+
+# Recovery options offered after each stage fails, keyed by (stage, whether
+# the error allows picking a different server type)
+_RECOVERY_CHOICES: Dict[Tuple[str, bool], Tuple[Tuple[str, str], ...]] = {
+    ("apply", False): (_RETRY, _EDIT, _SKIP, _ABORT),
+    ("apply", True): (_RESELECT, _RETRY, _EDIT, _SKIP, _ABORT),
+    ("ansible", False): (_RETRY, _EDIT, _ABORT),
+    ("ssh", False): (_RETRY, _SKIP, _ABORT),
+}
+_DEFAULT_RECOVERY_CHOICES = (_RETRY, _ABORT)
+
+
+def recovery_menu(
+    stage: str, name: str, error: str = ""
+) -> Tuple[str, Optional[Tuple[str, str]]]:
     """Show recovery options after failure.
 
     Args:
         stage: The failed stage name
         name: Deployment name
         error: Error message from the failed stage (used for smart recovery options)
-    """
-    choices = [("retry", "Retry")]
 
+    Returns:
+        The selected action and, for an unavailable server type, the
+        (server_type, location) parsed from the error
+    """
     # Check for server type error and offer reselection
+    error_info = None
     if stage == "apply" and error:
         error_info = detect_server_type_error(error)
-        if error_info:
-            choices.insert(0, ("reselect", "Select different server type"))
 
-    if stage in ("apply", "ansible"):
-        choices.append(("edit", "Edit configuration"))
-
-    if stage in ("apply", "ssh"):
-        choices.append(("skip", "Skip to next step"))
-
-    choices.append(("abort", "Abort (keep current state)"))
+    choices = _RECOVERY_CHOICES.get(
+        (stage, error_info is not None), _DEFAULT_RECOVERY_CHOICES
+    )
 
-    return (
+    action = (
         prompts.select(f"{stage.title()} failed. What would you like to do?", choices)
         or "abort"
     )
+    return action, error_info
 
 
-def handle_recovery_action(action: str, name: str, error: str = "") -> bool:
+def handle_recovery_action(
+    action: str, name: str, error_info: Optional[Tuple[str, str]] = None
+) -> bool:
     """Handle recovery action, returns True if should retry.
 
     Args:
         action: The selected recovery action
         name: Deployment name
-        error: Error message from the failed stage
+        error_info: (server_type, location) returned by recovery_menu
     """
     if action == "reselect":
-        error_info = detect_server_type_error(error)
         if error_info:
             current_type, location = error_info
             if reselect_server_type(name, current_type, location):
@@ -199,26 +280,55 @@ def handle_recovery_action(action: str, name: str, error: str = "") -> bool:
     return False  # Not handled here
 
 
+# Deployment stages. Each returns a StageResult and imports the terraform,
+# ansible or ssh module it needs only when a deployment actually runs.
+def _do_init(name: str) -> StageResult:
+    from ... import terraform
+
+    output.info("Initializing Terraform...")
+    return StageResult(success=terraform.init(name))
+
+
+def _do_apply(name: str) -> StageResult:
+    from ... import terraform
+
+    output.info("Applying Terraform configuration...")
+    result = terraform.apply(name)
+    return StageResult(success=result.success, error=result.error)
+
+
+def _do_ssh(name: str) -> StageResult:
+    from ... import ssh
+
+    ip = config.get_deployment_ip(name)
+    if ip:
+        output.info(f"Waiting for SSH on {ip}...")
+        return StageResult(success=ssh.wait_for_ssh(ip))
+    return StageResult(success=True)
+
+
+def _do_ansible(name: str) -> StageResult:
+    from ... import ansible
+
+    output.info("Running Ansible playbook...")
+    return StageResult(success=ansible.run_playbook(name))
+
+
+_STAGES: Dict[str, Callable[[str], StageResult]] = {
+    "init": _do_init,
+    "apply": _do_apply,
+    "ssh": _do_ssh,
+    "ansible": _do_ansible,
+}
+
+
 def run_stage(stage: str, name: str) -> StageResult:
     """Run a single deployment stage.
 
     Returns:
         StageResult with success status and any error message
     """
-    if stage == "init":
-        output.info("Initializing Terraform...")
-        return StageResult(success=terraform.init(name))
-    elif stage == "apply":
-        output.info("Applying Terraform configuration...")
-        result = terraform.apply(name)
-        return StageResult(success=result.success, error=result.error)
-    elif stage == "ssh":
-        ip = config.get_deployment_ip(name)
-        if ip:
-            output.info(f"Waiting for SSH on {ip}...")
-            return StageResult(success=ssh.wait_for_ssh(ip))
-        return StageResult(success=True)
-    elif stage == "ansible":
-        output.info("Running Ansible playbook...")
-        return StageResult(success=ansible.run_playbook(name))
-    return StageResult(success=False)
+    fn = _STAGES.get(stage)
+    if fn is None:
+        return StageResult(success=False, error=f"Unknown stage: {stage}")
+    return fn(name)
@@ -1,19 +1,34 @@
 """Management commands: ssh, edit, provision, update, validate."""
 
-from typing import Annotated, Optional
+from typing import Annotated, Final, Optional
 
 import typer
 
 from .. import output, prompts
-from ... import ansible, config, ssh
+from ... import config
 from .core import do_deploy
-from .helpers import check_prerequisites, get_deployment_name, open_editor
+from .helpers import (
+    check_prerequisites,
+    get_deployment_name,
+    open_editor,
+    set_verbose,
+)
+
+
+# (tag, label, checked by default) for the update playbook
+_UPDATE_CHOICES: Final = (
+    ("apt", "System packages (apt)", True),
+    ("ai_clis", "AI CLIs (Claude, Codex, Gemini)", True),
+    ("dev_tools", "Dev tools (lazygit, lazydocker)", False),
+)
 
 
 def ssh_cmd(
     name: Annotated[Optional[str], typer.Argument(help="Deployment name")] = None,
 ) -> None:
     """SSH to a deployment."""
+    from ... import ssh
+
     # require_ip=True ensures deployment has an IP
     name = get_deployment_name(name, "connect to", require_ip=True)
 
@@ -36,7 +51,9 @@ def edit(
     tfvars_path = config.get_tfvars_path(name)
     output.info(f"Editing {tfvars_path}")
 
-    if open_editor(tfvars_path):
+    edited = open_editor(tfvars_path)
+    config.invalidate(name)
+    if edited:
         output.success("Configuration saved")
         if prompts.confirm("Deploy now?", default=False):
             result = do_deploy(name)
@@ -45,12 +62,18 @@ def edit(
 
 def provision(
     name: Annotated[Optional[str], typer.Argument(help="Deployment name")] = None,
+    verbose: Annotated[
+        bool, typer.Option("--verbose", "-v", help="Show full ansible output")
+    ] = False,
 ) -> None:
     """Re-run ansible provisioning on a deployment.
 
     Use this to apply configuration changes (tmux, tools, etc.)
     without re-running terraform.
     """
+    from ... import ansible
+
+    set_verbose(verbose)
     if not check_prerequisites():
         raise typer.Exit(1)
 
@@ -70,8 +93,14 @@ def provision(
 
 def update(
     name: Annotated[Optional[str], typer.Argument(help="Deployment name")] = None,
+    verbose: Annotated[
+        bool, typer.Option("--verbose", "-v", help="Show full ansible output")
+    ] = False,
 ) -> None:
     """Update packages and tools on a deployment."""
+    from ... import ansible
+
+    set_verbose(verbose)
     if not check_prerequisites():
         raise typer.Exit(1)
 
@@ -82,11 +111,7 @@ def update(
     output.header("Update Options")
     updates = prompts.checkbox(
         "Select what to update:",
-        [
-            ("apt", "System packages (apt)", True),
-            ("ai_clis", "AI CLIs (Claude, Codex, Gemini)", True),
-            ("dev_tools", "Dev tools (lazygit, lazydocker)", False),
-        ],
+        _UPDATE_CHOICES,
     )
 
     if not updates:
@@ -104,12 +129,18 @@ def update(
 
 def validate(
     name: Annotated[Optional[str], typer.Argument(help="Deployment name")] = None,
+    verbose: Annotated[
+        bool, typer.Option("--verbose", "-v", help="Show full ansible output")
+    ] = False,
 ) -> None:
     """Validate a deployment is healthy and all services are running.
 
     Checks systemd services, port availability, HTTP endpoints,
     and CLI tools. Returns exit code 0 if all checks pass.
     """
+    from ... import ansible
+
+    set_verbose(verbose)
     if not check_prerequisites():
         raise typer.Exit(1)
 
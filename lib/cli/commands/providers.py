@@ -1,38 +1,104 @@
 """Provider configuration prompts."""
 
+import importlib
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional, Tuple
+
 import typer
 
 from .. import output, prompts
 from ... import config, credentials
-from ...providers import aws, digitalocean, hetzner
+from ...providers._cache import HETZNER_SERVER_TYPE_CATALOG, cached_catalog
+
+# Seconds to wait on a background API call before retrying it in the foreground
+_PREFETCH_TIMEOUT = 30
+
+
+def _prefetch(fn: Callable[..., Any], *args: Any) -> Optional[Future]:
+    """Start a provider API call in the background.
+
+    Runs on a daemon thread, so a prefetch abandoned by Ctrl-C or a cancelled
+    prompt never holds up exit until its HTTP request times out.
+    """
+    future: Future = Future()
+
+    def run() -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    try:
+        threading.Thread(target=run, daemon=True).start()
+    except RuntimeError:
+        return None
+    return future
+
+
+def _await_prefetch(
+    future: Optional[Future], fn: Callable[..., Any], *args: Any
+) -> Any:
+    """Get a prefetched result, falling back to a synchronous call.
+
+    API errors raised by the background call propagate to the caller.
+    """
+    if future is not None:
+        try:
+            return future.result(timeout=_PREFETCH_TIMEOUT)
+        except FutureTimeoutError:
+            future.cancel()
+    return fn(*args)
+
+
+def _required_password(message: str) -> str:
+    """Prompt for a secret, aborting as soon as the user cancels."""
+    value = prompts.password(message)
+    if value is None:
+        raise typer.Abort()
+    return value
 
 
-def prompt_or_select_credentials(provider: str) -> dict:
-    """Prompt for credentials or select from stored profiles."""
+def prompt_or_select_credentials(
+    provider: str,
+    on_credentials: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """Prompt for credentials or select from stored profiles.
+
+    Args:
+        provider: Provider name
+        on_credentials: Called with the credentials as soon as they are known,
+            before the optional save prompt, so callers can start API requests early
+    """
     stored = credentials.get_credentials_for_provider(provider)
     result = {}
 
     if stored:
-        cred_choices = [(c.name, c.provider) for c in stored]
+        stored_by_name = {c.name: c for c in stored}
+        cred_choices = [(name, c.provider) for name, c in stored_by_name.items()]
         selection = prompts.select_credentials(cred_choices, provider)
 
         if selection and selection != "new":
-            cred = next(c for c in stored if c.name == selection)
+            cred = stored_by_name[selection]
             output.success(f"Using credentials: {selection}")
+            if on_credentials:
+                on_credentials(cred.data)
             return cred.data
 
-    # Prompt for new credentials based on provider
+    # Prompt for new credentials based on provider; None means the user cancelled
     if provider == "hetzner":
-        result["token"] = prompts.password("Hetzner API token")
+        result["token"] = _required_password("Hetzner API token")
     elif provider == "aws":
-        result["access_key"] = prompts.password("AWS Access Key")
-        result["secret_key"] = prompts.password("AWS Secret Key")
+        result["access_key"] = _required_password("AWS Access Key")
+        result["secret_key"] = _required_password("AWS Secret Key")
     elif provider == "digitalocean":
-        result["token"] = prompts.password("DigitalOcean token")
+        result["token"] = _required_password("DigitalOcean token")
 
-    # Check for None values (user cancelled)
-    if any(v is None for v in result.values()):
-        raise typer.Abort()
+    if on_credentials:
+        on_credentials(result)
 
     # Offer to save (only if age is available)
     if credentials.is_available():
@@ -47,13 +113,39 @@ def prompt_or_select_credentials(provider: str) -> dict:
 
 def prompt_hetzner_config(cfg: config.DeploymentConfig) -> None:
     """Prompt for Hetzner-specific configuration using API."""
-    creds = prompt_or_select_credentials("hetzner")
+    prefetched = {}
+
+    def start_fetch(creds: dict) -> None:
+        from ...providers import hetzner
+
+        prefetched["locations"] = _prefetch(
+            cached_catalog, "hetzner-locations", hetzner.get_locations, creds["token"]
+        )
+        # The server type catalog doesn't depend on the location, so fetch
+        # it alongside and filter once a location is picked
+        prefetched["server_types"] = _prefetch(
+            cached_catalog,
+            HETZNER_SERVER_TYPE_CATALOG,
+            hetzner.fetch_server_types,
+            creds["token"],
+        )
+
+    creds = prompt_or_select_credentials("hetzner", on_credentials=start_fetch)
+    # Usually already imported by _prewarm_provider() while the user typed
+    from ...providers import hetzner
+
     cfg.hetzner_token = creds["token"]
 
     # Fetch locations from API
     output.info("Fetching locations...")
     try:
-        locations = hetzner.get_locations(cfg.hetzner_token)
+        locations = _await_prefetch(
+            prefetched.get("locations"),
+            cached_catalog,
+            "hetzner-locations",
+            hetzner.get_locations,
+            cfg.hetzner_token,
+        )
         location_choices = [
             (loc["name"], hetzner.format_location(loc)) for loc in locations
         ]
@@ -70,7 +162,14 @@ def prompt_hetzner_config(cfg: config.DeploymentConfig) -> None:
     # Fetch server types from API
     output.info("Fetching server types...")
     try:
-        server_types = hetzner.get_server_types(cfg.hetzner_token, cfg.hetzner_location)
+        catalog = _await_prefetch(
+            prefetched.get("server_types"),
+            cached_catalog,
+            HETZNER_SERVER_TYPE_CATALOG,
+            hetzner.fetch_server_types,
+            cfg.hetzner_token,
+        )
+        server_types = hetzner.filter_server_types(catalog, cfg.hetzner_location)
         type_choices = [
             (st["name"], hetzner.format_server_type(st)) for st in server_types
         ]
@@ -84,14 +183,37 @@ def prompt_hetzner_config(cfg: config.DeploymentConfig) -> None:
 
 def prompt_aws_config(cfg: config.DeploymentConfig) -> None:
     """Prompt for AWS-specific configuration using API."""
-    creds = prompt_or_select_credentials("aws")
+    prefetched = {}
+
+    def start_fetch(creds: dict) -> None:
+        from ...providers import aws
+
+        prefetched["regions"] = _prefetch(
+            cached_catalog,
+            "aws-regions",
+            aws.get_regions,
+            creds["access_key"],
+            creds["secret_key"],
+        )
+
+    creds = prompt_or_select_credentials("aws", on_credentials=start_fetch)
+    # Usually already imported by _prewarm_provider() while the user typed
+    from ...providers import aws
+
     cfg.aws_access_key = creds["access_key"]
     cfg.aws_secret_key = creds["secret_key"]
 
     # Fetch regions from API
     output.info("Fetching regions...")
     try:
-        regions = aws.get_regions(cfg.aws_access_key, cfg.aws_secret_key)
+        regions = _await_prefetch(
+            prefetched.get("regions"),
+            cached_catalog,
+            "aws-regions",
+            aws.get_regions,
+            cfg.aws_access_key,
+            cfg.aws_secret_key,
+        )
         region_choices = [(r["name"], aws.format_region(r)) for r in regions]
     except aws.AWSAPIError as e:
         output.error(f"Failed to fetch regions: {e}")
@@ -128,13 +250,42 @@ def prompt_aws_config(cfg: config.DeploymentConfig) -> None:
 
 def prompt_digitalocean_config(cfg: config.DeploymentConfig) -> None:
     """Prompt for DigitalOcean-specific configuration using API."""
-    creds = prompt_or_select_credentials("digitalocean")
+    prefetched = {}
+
+    def start_fetch(creds: dict) -> None:
+        from ...providers import digitalocean
+
+        prefetched["regions"] = _prefetch(
+            cached_catalog,
+            "digitalocean-regions",
+            digitalocean.get_regions,
+            creds["token"],
+        )
+        # Sizes don't depend on the region, so fetch them alongside and
+        # filter once a region is picked
+        prefetched["sizes"] = _prefetch(
+            cached_catalog,
+            "digitalocean-size-catalog",
+            digitalocean.fetch_sizes,
+            creds["token"],
+        )
+
+    creds = prompt_or_select_credentials("digitalocean", on_credentials=start_fetch)
+    # Usually already imported by _prewarm_provider() while the user typed
+    from ...providers import digitalocean
+
     cfg.digitalocean_token = creds["token"]
 
     # Fetch regions from API
     output.info("Fetching regions...")
     try:
-        regions = digitalocean.get_regions(cfg.digitalocean_token)
+        regions = _await_prefetch(
+            prefetched.get("regions"),
+            cached_catalog,
+            "digitalocean-regions",
+            digitalocean.get_regions,
+            cfg.digitalocean_token,
+        )
         region_choices = [(r["slug"], digitalocean.format_region(r)) for r in regions]
     except digitalocean.DigitalOceanAPIError as e:
         output.error(f"Failed to fetch regions: {e}")
@@ -149,7 +300,14 @@ def prompt_digitalocean_config(cfg: config.DeploymentConfig) -> None:
     # Fetch sizes from API
     output.info("Fetching droplet sizes...")
     try:
-        sizes = digitalocean.get_sizes(cfg.digitalocean_token, cfg.digitalocean_region)
+        catalog = _await_prefetch(
+            prefetched.get("sizes"),
+            cached_catalog,
+            "digitalocean-size-catalog",
+            digitalocean.fetch_sizes,
+            cfg.digitalocean_token,
+        )
+        sizes = digitalocean.filter_sizes(catalog, cfg.digitalocean_region)
         size_choices = [(s["slug"], digitalocean.format_size(s)) for s in sizes]
     except digitalocean.DigitalOceanAPIError as e:
         output.error(f"Failed to fetch sizes: {e}")
@@ -163,6 +321,14 @@ def prompt_digitalocean_config(cfg: config.DeploymentConfig) -> None:
     )
 
 
+def _prewarm_provider(provider: str) -> None:
+    """Import a provider's API client in the background.
+
+    The import (and its HTTP stack) then overlaps with the credential prompt.
+    """
+    _prefetch(importlib.import_module, f"...providers.{provider}", __package__)
+
+
 def prompt_new_config(name: str) -> config.DeploymentConfig:
     """Interactively prompt for deployment configuration."""
     cfg = config.DeploymentConfig()
@@ -173,6 +339,7 @@ def prompt_new_config(name: str) -> config.DeploymentConfig:
     cfg.provider = prompts.select_provider()
     if not cfg.provider:
         raise typer.Abort()
+    _prewarm_provider(cfg.provider)
 
     # Provider-specific prompts
     if cfg.provider == "hetzner":
@@ -234,7 +401,7 @@ def prompt_tls_config(cfg: config.DeploymentConfig) -> None:
     """Prompt for TLS certificate configuration."""
     # Domain name
     cfg.domain_name = prompts.text("Domain name (e.g., dev.example.com)") or ""
-    while not cfg.domain_name or "." not in cfg.domain_name:
+    while not prompts.is_valid_domain(cfg.domain_name):
         output.warning("Please enter a valid domain name")
         cfg.domain_name = prompts.text("Domain name") or ""
 
@@ -263,35 +430,45 @@ def prompt_tls_config(cfg: config.DeploymentConfig) -> None:
     _prompt_dns_credentials(cfg)
 
 
-def _get_dns_provider_choices(cloud_provider: str) -> list:
-    """Get DNS provider choices, prioritizing native options for the cloud provider."""
-    # Map of provider key to display name
-    dns_providers = {
-        "cloudflare": "Cloudflare",
-        "route53": "AWS Route 53",
-        "digitalocean": "DigitalOcean DNS",
-        "hetzner": "Hetzner DNS",
-    }
-
-    # Map cloud provider to its native DNS provider
-    native_dns = {
-        "aws": "route53",
-        "digitalocean": "digitalocean",
-        "hetzner": "hetzner",
-    }
-
-    # Build choices with native provider first (if applicable)
-    native = native_dns.get(cloud_provider)
-    choices = []
+# Map of DNS provider key to display name
+_DNS_PROVIDERS = {
+    "cloudflare": "Cloudflare",
+    "route53": "AWS Route 53",
+    "digitalocean": "DigitalOcean DNS",
+    "hetzner": "Hetzner DNS",
+}
 
-    if native:
-        choices.append((native, f"{dns_providers[native]} (Recommended)"))
+# Map cloud provider to its native DNS provider
+_NATIVE_DNS = {
+    "aws": "route53",
+    "digitalocean": "digitalocean",
+    "hetzner": "hetzner",
+}
 
-    for key, label in dns_providers.items():
+_DnsChoices = Tuple[Tuple[str, str], ...]
+
+
+def _build_dns_choices(native: Optional[str]) -> _DnsChoices:
+    """Build DNS provider choices with the native provider (if any) first."""
+    choices = []
+    if native:
+        choices.append((native, f"{_DNS_PROVIDERS[native]} (Recommended)"))
+    for key, label in _DNS_PROVIDERS.items():
         if key != native:
             choices.append((key, label))
+    return tuple(choices)
+
+
+# The set of cloud providers is fixed, so every choice list is built up front
+_DNS_CHOICES_BY_PROVIDER: Dict[Optional[str], _DnsChoices] = {
+    cloud: _build_dns_choices(native) for cloud, native in _NATIVE_DNS.items()
+}
+_DNS_CHOICES_BY_PROVIDER[None] = _build_dns_choices(None)
 
-    return choices
+
+def _get_dns_provider_choices(cloud_provider: str) -> _DnsChoices:
+    """Get DNS provider choices, prioritizing native options for the cloud provider."""
+    return _DNS_CHOICES_BY_PROVIDER.get(cloud_provider, _DNS_CHOICES_BY_PROVIDER[None])
 
 
 def _prompt_dns_credentials(cfg: config.DeploymentConfig) -> None:
@@ -1,19 +1,19 @@
 """Interactive menu for the CLI."""
 
-import questionary
-from questionary import Choice, Separator
-
-from .prompts import STYLE
-
 
 def interactive_menu() -> None:
     """Show interactive menu and run selected command."""
+    # questionary pulls in prompt_toolkit; only load it when the menu is shown
+    import questionary
+    from questionary import Choice, Separator
+
     from .output import console
+    from .prompts import STYLE
 
-    console.print()
-    console.print("[bold cyan]=== Roughneck ===[/bold cyan]")
-    console.print("[dim]AI-powered cloud development environments[/dim]")
-    console.print()
+    console.print(
+        "\n[bold cyan]=== Roughneck ===[/bold cyan]\n"
+        "[dim]AI-powered cloud development environments[/dim]\n"
+    )
 
     action = questionary.select(
         "What would you like to do?",
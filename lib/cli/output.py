@@ -1,45 +1,54 @@
 """Rich-based output helpers for the CLI."""
 
-import json
+import sys
 from typing import Any, Dict, List
 
+import orjson
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 
 console = Console()
 
+# Status prefixes, composed once so each message is a single concatenation
+_SUCCESS = "[green]✓[/green] "
+_ERROR = "[red]✗[/red] [red]ERROR:[/red] "
+_WARNING = "[yellow]![/yellow] [yellow]WARNING:[/yellow] "
+_INFO = "[cyan]→[/cyan] "
+
 
 def success(message: str) -> None:
     """Print a success message."""
-    console.print(f"[green]✓[/green] {message}")
+    console.print(_SUCCESS + message)
 
 
 def error(message: str) -> None:
     """Print an error message."""
-    console.print(f"[red]✗[/red] [red]ERROR:[/red] {message}")
+    console.print(_ERROR + message)
 
 
 def warning(message: str) -> None:
     """Print a warning message."""
-    console.print(f"[yellow]![/yellow] [yellow]WARNING:[/yellow] {message}")
+    console.print(_WARNING + message)
 
 
 def info(message: str) -> None:
     """Print an info message."""
-    console.print(f"[cyan]→[/cyan] {message}")
+    console.print(_INFO + message)
 
 
 def header(title: str) -> None:
     """Print a section header."""
-    console.print()
-    console.print(f"[bold]=== {title} ===[/bold]")
-    console.print()
+    console.print(f"\n[bold]=== {title} ===[/bold]\n")
 
 
 def print_json(data: Any) -> None:
     """Print data as formatted JSON."""
-    print(json.dumps(data, indent=2, default=str))
+    # Written as bytes; flush any pending text first so output stays ordered
+    sys.stdout.flush()
+    sys.stdout.buffer.write(orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2))
+    sys.stdout.buffer.write(b"\n")
+    sys.stdout.flush()
 
 
 def print_deployments(
@@ -54,20 +63,24 @@ def print_deployments(
         console.print("[dim]No deployments found[/dim]")
         return
 
-    table = Table(title="Deployments", show_header=True, header_style="bold cyan")
-    table.add_column("Name", style="cyan")
-    table.add_column("Provider", style="green")
-    table.add_column("IP", style="yellow")
-    table.add_column("Status", style="magenta")
-
-    for d in deployments:
-        status = "[green]deployed[/green]" if d.get("ip") else "[dim]configured[/dim]"
-        table.add_row(
+    rows = [
+        (
             d.get("name", "-"),
             d.get("provider", "-"),
             d.get("ip") or "-",
-            status,
+            "[green]deployed[/green]" if d.get("ip") else "[dim]configured[/dim]",
         )
+        for d in deployments
+    ]
+
+    # Cells are short single tokens; no_wrap skips Rich's wrap measurement
+    table = Table(title="Deployments", show_header=True, header_style="bold cyan")
+    table.add_column("Name", style="cyan", no_wrap=True)
+    table.add_column("Provider", style="green", no_wrap=True)
+    table.add_column("IP", style="yellow", no_wrap=True)
+    table.add_column("Status", style="magenta", no_wrap=True)
+    for row in rows:
+        table.add_row(*row)
 
     console.print(table)
 
@@ -1,11 +1,13 @@
 """Questionary-based interactive prompts."""
 
 import re
-from typing import List, Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 
 import questionary
 from questionary import Choice, Style
 
+from .output import warning
+
 # Custom style for consistent look
 STYLE = Style([
     ("qmark", "fg:cyan bold"),
@@ -18,23 +20,43 @@ STYLE = Style([
     ("instruction", "fg:gray"),
 ])
 
-# RFC 5322 compliant email regex
-EMAIL_REGEX = re.compile(
-    r"(?:[a-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&'*+/=?^_`{|}~-]+)*"
-    r'|"(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21\x23-\x5b\x5d-\x7f]'
-    r'|\\[\x01-\x09\x0b\x0c\x0e-\x7f])*")'
-    r"@(?:(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z0-9](?:[a-z0-9-]*[a-z0-9])?"
-    r"|\[(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}"
-    r"(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?|[a-z0-9-]*[a-z0-9]:"
-    r"(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21-\x5a\x53-\x7f]"
-    r"|\\[\x01-\x09\x0b\x0c\x0e-\x7f])+)\])",
-    re.IGNORECASE,
+# Email address parts, checked separately after splitting on the last "@"
+_LOCAL_RE = re.compile(r"[A-Za-z0-9._%+-]+")
+_DOMAIN_RE = re.compile(r"(?:[A-Za-z0-9-]+\.)+[A-Za-z]{2,}")
+_local_fullmatch = _LOCAL_RE.fullmatch
+_domain_fullmatch = _DOMAIN_RE.fullmatch
+
+# Hostname with at least two labels; labels are 1-63 chars, no edge hyphens
+_HOSTNAME_RE = re.compile(
+    r"(?=.{1,253}$)(?!-)[A-Za-z0-9-]{1,63}(?<!-)(?:\.(?!-)[A-Za-z0-9-]{1,63}(?<!-))+"
 )
+_hostname_fullmatch = _HOSTNAME_RE.fullmatch
+
+# Bare IPv4 address (CIDR entries are accepted as-is)
+_IPV4_RE = re.compile(r"\d+\.\d+\.\d+\.\d+")
+_ipv4_fullmatch = _IPV4_RE.fullmatch
 
 
 def is_valid_email(email: str) -> bool:
-    """Validate email against RFC 5322."""
-    return bool(EMAIL_REGEX.fullmatch(email))
+    """Validate email address format (local@domain.tld).
+
+    Internationalized domains are checked in their IDNA (punycode) form.
+    """
+    if len(email) > 254:
+        return False
+    local, _, domain = email.rpartition("@")
+    if not local or not _local_fullmatch(local):
+        return False
+    try:
+        domain = domain.encode("idna").decode("ascii")
+    except UnicodeError:
+        return False
+    return bool(_domain_fullmatch(domain))
+
+
+def is_valid_domain(domain: str) -> bool:
+    """Validate a fully qualified domain name (e.g. dev.example.com)."""
+    return bool(_hostname_fullmatch(domain))
 
 
 def text(
@@ -93,7 +115,7 @@ def confirm(message: str, default: bool = True) -> bool:
 
 def select(
     message: str,
-    choices: List[Tuple[str, str]],
+    choices: Sequence[Tuple[str, str]],
     default: Optional[str] = None,
 ) -> Optional[str]:
     """Prompt to select from choices.
@@ -173,7 +195,7 @@ def confirm_destroy(name: str) -> bool:
 
 def checkbox(
     message: str,
-    choices: List[Tuple[str, str, bool]],
+    choices: Sequence[Tuple[str, str, bool]],
 ) -> List[str]:
     """Prompt for multiple selection with checkboxes.
 
@@ -212,10 +234,9 @@ def prompt_firewall_ips() -> List[str]:
         if not ip:
             break
         # Basic CIDR validation
-        if "/" in ip or re.match(r"^\d+\.\d+\.\d+\.\d+$", ip):
+        if "/" in ip or _ipv4_fullmatch(ip):
             ips.append(ip if "/" in ip else f"{ip}/32")
         else:
-            from .output import warning
             warning(f"Invalid IP format: {ip}")
 
     return ips
@@ -4,9 +4,11 @@ import json
 import os
 import re
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Tuple
 
 
 @dataclass
@@ -66,6 +68,22 @@ class DeploymentConfig:
     hetzner_dns_token: str = ""
 
 
+# Parsed files by deployment name, together with the (mtime_ns, size) stamp
+# they were read at, see file_stamp(). A changed file is simply re-read.
+_tfvars_cache: Dict[str, Tuple[Tuple[int, int], DeploymentConfig]] = {}
+_state_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+
+def file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    """Get a cheap change marker for a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+@lru_cache(maxsize=None)
 def get_root_dir() -> Path:
     """Get the root directory of roughneck."""
     # Assumes this file is in lib/
@@ -95,17 +113,26 @@ def copy_terraform_to_deployment(name: str) -> None:
     shutil.copytree(src, dst)
 
 
-def list_deployments() -> List[str]:
-    """List all deployment names."""
+@lru_cache(maxsize=1)
+def _list_deployments() -> Tuple[str, ...]:
     deployments_dir = get_deployments_dir()
     if not deployments_dir.exists():
-        return []
+        return ()
 
     deployments = []
     for item in deployments_dir.iterdir():
         if item.is_dir() and (item / "terraform.tfvars").exists():
             deployments.append(item.name)
-    return sorted(deployments)
+    return tuple(sorted(deployments))
+
+
+def list_deployments() -> List[str]:
+    """List all deployment names.
+
+    The directory is scanned once per process; write_tfvars() and
+    delete_deployment() reset the cached list.
+    """
+    return list(_list_deployments())
 
 
 def deployment_exists(name: str) -> bool:
@@ -124,15 +151,26 @@ def get_tfvars_path(name: str) -> str:
 
 
 def get_deployment_state(name: str) -> Optional[Dict[str, Any]]:
-    """Get terraform state for a deployment, if it exists."""
+    """Get terraform state for a deployment, if it exists.
+
+    The parsed state is reused until the file changes on disk.
+    """
     state_file = get_deployment_dir(name) / "terraform.tfstate"
-    if not state_file.exists():
+    stamp = file_stamp(state_file)
+    if stamp is None:
         return None
+
+    cached = _state_cache.get(name)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
     try:
         with open(state_file) as f:
-            return json.load(f)
+            state = json.load(f)
     except (json.JSONDecodeError, OSError):
         return None
+    _state_cache[name] = (stamp, state)
+    return state
 
 
 def get_deployment_ip(name: str) -> Optional[str]:
@@ -154,6 +192,34 @@ def get_deployment_provider(name: str) -> Optional[str]:
     return None
 
 
+def _deployment_status(name: str) -> Dict[str, Any]:
+    ip = get_deployment_ip(name)
+    return {
+        "provider": get_deployment_provider(name) or "unknown",
+        "ip": ip,
+        "status": "deployed" if ip else "configured",
+    }
+
+
+def _map_deployments(fn: Callable[[str], Any]) -> Dict[str, Any]:
+    """Call fn for every deployment, in parallel since their files are independent."""
+    deployments = list_deployments()
+    if len(deployments) <= 1:
+        return {name: fn(name) for name in deployments}
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        return dict(zip(deployments, executor.map(fn, deployments)))
+
+
+def load_all_deployment_status() -> Dict[str, Dict[str, Any]]:
+    """Get provider, IP and status for every deployment."""
+    return _map_deployments(_deployment_status)
+
+
+def load_all_deployment_ips() -> Dict[str, Optional[str]]:
+    """Get the IP (or None) of every deployment, reading only the state files."""
+    return _map_deployments(get_deployment_ip)
+
+
 def get_private_key_path(name: str) -> Optional[str]:
     """Get the private key path for a deployment."""
     # Check for generated key
@@ -258,14 +324,31 @@ def write_tfvars(name: str, config: DeploymentConfig) -> None:
     tfvars_path = deploy_dir / "terraform.tfvars"
     with open(tfvars_path, "w") as f:
         f.write("\n".join(lines) + "\n")
+    invalidate(name)
+    _list_deployments.cache_clear()
+
+
+def invalidate(name: str) -> None:
+    """Drop the cached files for a deployment (after it was edited or removed)."""
+    _tfvars_cache.pop(name, None)
+    _state_cache.pop(name, None)
 
 
 def read_tfvars(name: str) -> Optional[DeploymentConfig]:
-    """Read terraform.tfvars for a deployment."""
+    """Read terraform.tfvars for a deployment.
+
+    Results are cached per process and re-read when the file changes on
+    disk, so edits made in the user's editor are picked up.
+    """
     tfvars_path = get_deployment_dir(name) / "terraform.tfvars"
-    if not tfvars_path.exists():
+    stamp = file_stamp(tfvars_path)
+    if stamp is None:
         return None
 
+    cached = _tfvars_cache.get(name)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
     config = DeploymentConfig()
     try:
         with open(tfvars_path) as f:
@@ -304,6 +387,7 @@ def read_tfvars(name: str) -> Optional[DeploymentConfig]:
                     items = re.findall(r'"([^"]*)"', value)
                     setattr(config, key, items)
 
+        _tfvars_cache[name] = (stamp, config)
         return config
     except OSError:
         return None
@@ -314,6 +398,8 @@ def delete_deployment(name: str) -> None:
     deploy_dir = get_deployment_dir(name)
     if deploy_dir.exists():
         shutil.rmtree(deploy_dir)
+    invalidate(name)
+    _list_deployments.cache_clear()
 
 
 def get_ssh_user(name: str) -> str:
@@ -1,11 +1,15 @@
 """Encrypted credential storage using age."""
 
-import json
 import shutil
 import subprocess
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+import orjson
+
+from .config import file_stamp
 
 
 @dataclass
@@ -20,6 +24,11 @@ class Credential:
 # Age identity file location
 AGE_KEY_PATH = Path.home() / ".age" / "key.txt"
 
+# Decrypted credentials and the public key, each with the (mtime_ns, size)
+# of the file they were read from; a changed file is read again
+_creds_cache: Optional[Tuple[Tuple[int, int], List[Credential]]] = None
+_public_key_cache: Optional[Tuple[Tuple[int, int], str]] = None
+
 
 def get_credentials_file() -> Path:
     """Get path to encrypted credentials file."""
@@ -28,18 +37,21 @@ def get_credentials_file() -> Path:
     return get_root_dir() / ".credentials.age"
 
 
+@lru_cache(maxsize=1)
 def find_age_command() -> Optional[str]:
     """Check if age CLI is available."""
     return shutil.which("age")
 
 
+@lru_cache(maxsize=1)
 def find_age_keygen_command() -> Optional[str]:
     """Check if age-keygen CLI is available."""
     return shutil.which("age-keygen")
 
 
+@lru_cache(maxsize=1)
 def is_available() -> bool:
-    """Check if age encryption is available."""
+    """Check if age encryption is available (probed once per process)."""
     return find_age_command() is not None and find_age_keygen_command() is not None
 
 
@@ -54,17 +66,28 @@ def ensure_age_key() -> Path:
     return AGE_KEY_PATH
 
 
+_PUBLIC_KEY_PREFIX = "# public key:"
+
+
 def get_public_key() -> str:
     """Get public key from identity file."""
-    content = AGE_KEY_PATH.read_text()
-    for line in content.split("\n"):
-        if line.startswith("# public key:"):
-            return line.split(": ")[1].strip()
+    global _public_key_cache
+    stamp = file_stamp(AGE_KEY_PATH)
+    if _public_key_cache is not None and _public_key_cache[0] == stamp:
+        return _public_key_cache[1]
+
+    # age-keygen writes the public key comment at the top, before the secret
+    with open(AGE_KEY_PATH) as f:
+        for line in f:
+            if line.startswith(_PUBLIC_KEY_PREFIX):
+                key = line[len(_PUBLIC_KEY_PREFIX):].strip()
+                _public_key_cache = (stamp, key)
+                return key
     raise ValueError("Could not find public key in age identity")
 
 
-def encrypt(data: str) -> bytes:
-    """Encrypt string data with age."""
+def encrypt(data: bytes) -> bytes:
+    """Encrypt data with age."""
     ensure_age_key()
     pub_key = get_public_key()
     age_cmd = find_age_command()
@@ -73,14 +96,14 @@ def encrypt(data: str) -> bytes:
 
     result = subprocess.run(
         [age_cmd, "-r", pub_key],
-        input=data.encode(),
+        input=data,
         capture_output=True,
         check=True,
     )
     return result.stdout
 
 
-def decrypt(data: bytes) -> str:
+def decrypt(data: bytes) -> bytes:
     """Decrypt age-encrypted data."""
     ensure_age_key()
     age_cmd = find_age_command()
@@ -93,28 +116,40 @@ def decrypt(data: bytes) -> str:
         capture_output=True,
         check=True,
     )
-    return result.stdout.decode()
+    return result.stdout
 
 
 def load_credentials() -> List[Credential]:
-    """Load all stored credentials."""
+    """Load all stored credentials.
+
+    The file is decrypted once and reused until it changes on disk.
+    """
+    global _creds_cache
     cred_file = get_credentials_file()
-    if not cred_file.exists():
+    stamp = file_stamp(cred_file)
+    if stamp is None:
         return []
+    if _creds_cache is not None and _creds_cache[0] == stamp:
+        return list(_creds_cache[1])
 
     try:
         decrypted = decrypt(cred_file.read_bytes())
-        data = json.loads(decrypted)
-        return [Credential(**c) for c in data]
-    except (subprocess.CalledProcessError, json.JSONDecodeError):
+        data = orjson.loads(decrypted)
+        creds = [Credential(**c) for c in data]
+    except (subprocess.CalledProcessError, orjson.JSONDecodeError):
         return []
+    _creds_cache = (stamp, creds)
+    return list(creds)
 
 
 def save_credentials(creds: List[Credential]) -> None:
     """Save all credentials (encrypted)."""
     data = [{"name": c.name, "provider": c.provider, "data": c.data} for c in creds]
-    encrypted = encrypt(json.dumps(data, indent=2))
-    get_credentials_file().write_bytes(encrypted)
+    global _creds_cache
+    encrypted = encrypt(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    cred_file = get_credentials_file()
+    cred_file.write_bytes(encrypted)
+    _creds_cache = (file_stamp(cred_file), list(creds))
 
 
 def add_credential(name: str, provider: str, data: Dict[str, str]) -> None:
@@ -138,7 +173,8 @@ def remove_credential(name: str) -> bool:
 
 def get_credentials_for_provider(provider: str) -> List[Credential]:
     """Get all credentials for a specific provider."""
-    if not is_available():
+    # Nothing stored yet: skip probing PATH for age
+    if not get_credentials_file().exists() or not is_available():
         return []
     return [c for c in load_credentials() if c.provider == provider]
 
@@ -0,0 +1,102 @@
+"""Ansible inventory generation from terraform state."""
+
+import os
+from pathlib import Path
+from typing import Optional
+
+from .config import (
+    get_deployment_dir,
+    get_deployment_state,
+    get_private_key_path,
+    read_tfvars,
+)
+
+_HOST_TEMPLATE = """[roughneck]
+{ip} ansible_user={user} ansible_ssh_private_key_file={key}
+
+[roughneck:vars]
+"""
+
+# Group vars, in the same order as terraform/inventory.tpl
+_INVENTORY_VARS = (
+    "enable_gastown",
+    "enable_beads",
+    "enable_k9s",
+    "enable_systemd_services",
+    "enable_autocoder",
+    "enable_glm",
+    "zai_key",
+    "enable_letsencrypt",
+    "domain_name",
+    "tls_mode",
+    "dns_provider",
+    "cloudflare_api_token",
+    "route53_access_key",
+    "route53_secret_key",
+    "digitalocean_dns_token",
+    "hetzner_dns_token",
+)
+
+
+def _mtime_ns(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _get_output(state: dict, key: str) -> Optional[str]:
+    try:
+        return state["outputs"][key]["value"]
+    except (KeyError, TypeError):
+        return None
+
+
+def materialize_inventory(name: str) -> Optional[Path]:
+    """Get the ansible inventory for a deployment.
+
+    The inventory terraform writes is reused while it is at least as new as
+    the state and tfvars. Otherwise it is re-rendered from the state outputs
+    and the current tfvars, so it cannot drift from the infrastructure.
+
+    Returns None if there is no inventory and no server to render one for.
+    """
+    deploy_dir = get_deployment_dir(name)
+    inventory_path = deploy_dir / "inventory.ini"
+
+    inventory_mtime = _mtime_ns(inventory_path)
+    source_mtimes = [
+        m
+        for m in (
+            _mtime_ns(deploy_dir / "terraform.tfstate"),
+            _mtime_ns(deploy_dir / "terraform.tfvars"),
+        )
+        if m is not None
+    ]
+    if inventory_mtime is not None and inventory_mtime >= max(source_mtimes, default=0):
+        return inventory_path
+
+    state = get_deployment_state(name)
+    cfg = read_tfvars(name)
+    ip = _get_output(state, "server_ip") if state else None
+    key_path = (_get_output(state, "private_key_path") if state else None) or (
+        get_private_key_path(name)
+    )
+    if not ip or not cfg or not key_path:
+        return inventory_path if inventory_mtime is not None else None
+
+    # Matches ssh_user in terraform/providers/*/main.tf
+    user = "ubuntu" if cfg.provider == "aws" else "root"
+
+    lines = [_HOST_TEMPLATE.format(ip=ip, user=user, key=key_path)]
+    for var in _INVENTORY_VARS:
+        value = getattr(cfg, var)
+        if isinstance(value, bool):
+            value = str(value).lower()
+        lines.append(f"{var}={value}\n")
+
+    tmp_path = inventory_path.with_suffix(".ini.tmp")
+    with open(tmp_path, "w") as f:
+        f.write("".join(lines))
+    os.replace(tmp_path, inventory_path)
+    return inventory_path
@@ -0,0 +1,73 @@
+"""On-disk cache for provider API responses."""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+# Provider catalogs (regions, server types) change on the order of weeks
+DEFAULT_TTL = 24 * 60 * 60
+
+# Key for the Hetzner server type catalog, shared by setup and the server
+# type reselection offered when a deploy fails
+HETZNER_SERVER_TYPE_CATALOG = "hetzner-server-type-catalog"
+
+
+def get_cache_dir() -> Path:
+    """Get the directory for cached provider responses."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "roughneck" / "providers"
+
+
+def credential_hash(*parts: str) -> str:
+    """Short, non-reversible identifier used to scope cache entries per account."""
+    digest = hashlib.blake2b(digest_size=8)
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def cached(key: str, ttl: int, loader: Callable[[], Any]) -> Any:
+    """Return the cached JSON value for key, or call loader and cache its result.
+
+    Entries older than ttl seconds are reloaded. Errors raised by loader
+    propagate and nothing is cached; failures reading or writing the cache
+    itself are ignored.
+    """
+    path = get_cache_dir() / f"{key}.json"
+    try:
+        if time.time() - path.stat().st_mtime < ttl:
+            with open(path) as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    value = loader()
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(value, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError):
+            os.unlink(tmp_path)
+    except OSError:
+        pass
+
+    return value
+
+
+def cached_catalog(endpoint: str, fn: Callable[..., Any], *args: str) -> Any:
+    """Call a provider catalog API through the on-disk cache.
+
+    Entries are keyed by endpoint and a hash of the call arguments, so each
+    account (and location/region) gets its own entry without storing secrets.
+    """
+    key = f"{endpoint}-{credential_hash(*args)}"
+    return cached(key, DEFAULT_TTL, lambda: fn(*args))
@@ -0,0 +1,26 @@
+"""HTTP sessions for the provider API clients."""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# One connection pool behind every session (urllib3 pools are thread-safe), so
+# a TLS connection opened by a background prefetch is reused in the foreground
+_ADAPTER = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+
+_local = threading.local()
+
+
+def get_session() -> requests.Session:
+    """Get the calling thread's session.
+
+    requests doesn't promise that a Session is thread-safe, so each thread
+    gets its own, all sharing _ADAPTER.
+    """
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.mount("https://", _ADAPTER)
+        _local.session = session
+    return session
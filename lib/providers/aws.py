@@ -3,13 +3,49 @@
 import hashlib
 import hmac
 import urllib.parse
+import xml.etree.ElementTree as ET
 from datetime import datetime, timezone
-from typing import Optional
+from functools import lru_cache
+from typing import Iterator, Optional
 
 import requests
+from urllib3.exceptions import HTTPError as URLLib3Error
+
+from ._http import get_session
+
+# SigV4 constants; requests are bodiless GETs signed over these two headers
+_ALGORITHM = "AWS4-HMAC-SHA256"
+_AWS4_REQUEST = "aws4_request"
+_SIGNED_HEADERS = "host;x-amz-date"
+_EMPTY_SHA256 = hashlib.sha256(b"").hexdigest()
 
 # Common instance type families to show (keeps list manageable)
 COMMON_FAMILIES = ["t3", "t3a", "t4g", "m6i", "m6a", "m7i", "c6i", "c6a"]
+_FAMILY_SET = frozenset(COMMON_FAMILIES)
+_FAMILY_INDEX = {family: i for i, family in enumerate(COMMON_FAMILIES)}
+
+# Sort order for instance sizes within a family
+_SIZE_ORDER = {"nano": 0, "micro": 1, "small": 2, "medium": 3, "large": 4, "xlarge": 5, "2xlarge": 6}
+
+# Human-readable region names
+_REGION_NAMES = {
+    "us-east-1": "US East (N. Virginia)",
+    "us-east-2": "US East (Ohio)",
+    "us-west-1": "US West (N. California)",
+    "us-west-2": "US West (Oregon)",
+    "eu-west-1": "Europe (Ireland)",
+    "eu-west-2": "Europe (London)",
+    "eu-west-3": "Europe (Paris)",
+    "eu-central-1": "Europe (Frankfurt)",
+    "eu-north-1": "Europe (Stockholm)",
+    "ap-northeast-1": "Asia Pacific (Tokyo)",
+    "ap-northeast-2": "Asia Pacific (Seoul)",
+    "ap-southeast-1": "Asia Pacific (Singapore)",
+    "ap-southeast-2": "Asia Pacific (Sydney)",
+    "ap-south-1": "Asia Pacific (Mumbai)",
+    "sa-east-1": "South America (São Paulo)",
+    "ca-central-1": "Canada (Central)",
+}
 
 
 class AWSAPIError(Exception):
@@ -19,15 +55,20 @@ class AWSAPIError(Exception):
 
 def _sign(key: bytes, msg: str) -> bytes:
     """HMAC-SHA256 sign."""
-    return hmac.new(key, msg.encode("utf-8"), hashlib.sha256).digest()
+    return hmac.digest(key, msg.encode("utf-8"), "sha256")
 
 
+@lru_cache(maxsize=8)
 def _get_signature_key(secret_key: str, date_stamp: str, region: str, service: str) -> bytes:
-    """Derive the signing key."""
-    k_date = _sign(f"AWS4{secret_key}".encode("utf-8"), date_stamp)
+    """Derive the signing key.
+
+    The key only changes with the date and region, so it is derived once
+    and reused by every request in that scope.
+    """
+    k_date = _sign(b"AWS4" + secret_key.encode("utf-8"), date_stamp)
     k_region = _sign(k_date, region)
     k_service = _sign(k_region, service)
-    k_signing = _sign(k_service, "aws4_request")
+    k_signing = _sign(k_service, _AWS4_REQUEST)
     return k_signing
 
 
@@ -37,8 +78,11 @@ def _make_request(
     region: str,
     action: str,
     params: Optional[dict] = None,
-) -> dict:
-    """Make signed request to AWS EC2 API."""
+) -> requests.Response:
+    """Make signed request to AWS EC2 API.
+
+    The response body is left unread so it can be streamed with _iter_items.
+    """
     service = "ec2"
     host = f"ec2.{region}.amazonaws.com"
     endpoint = f"https://{host}"
@@ -51,9 +95,12 @@ def _make_request(
     if params:
         request_params.update(params)
 
-    # Create canonical query string
-    sorted_params = sorted(request_params.items())
-    canonical_querystring = urllib.parse.urlencode(sorted_params)
+    # Create canonical query string (SigV4 wants %20, not urlencode's "+")
+    quote = urllib.parse.quote
+    canonical_querystring = "&".join(
+        f"{quote(k, safe='')}={quote(v, safe='')}"
+        for k, v in sorted(request_params.items())
+    )
 
     # Timestamps
     t = datetime.now(timezone.utc)
@@ -64,30 +111,27 @@ def _make_request(
     method = "GET"
     canonical_uri = "/"
     canonical_headers = f"host:{host}\nx-amz-date:{amz_date}\n"
-    signed_headers = "host;x-amz-date"
-    payload_hash = hashlib.sha256(b"").hexdigest()
 
     canonical_request = (
         f"{method}\n{canonical_uri}\n{canonical_querystring}\n"
-        f"{canonical_headers}\n{signed_headers}\n{payload_hash}"
+        f"{canonical_headers}\n{_SIGNED_HEADERS}\n{_EMPTY_SHA256}"
     )
 
     # Create string to sign
-    algorithm = "AWS4-HMAC-SHA256"
-    credential_scope = f"{date_stamp}/{region}/{service}/aws4_request"
+    credential_scope = f"{date_stamp}/{region}/{service}/{_AWS4_REQUEST}"
     string_to_sign = (
-        f"{algorithm}\n{amz_date}\n{credential_scope}\n"
+        f"{_ALGORITHM}\n{amz_date}\n{credential_scope}\n"
         f"{hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()}"
     )
 
     # Calculate signature
     signing_key = _get_signature_key(secret_key, date_stamp, region, service)
-    signature = hmac.new(signing_key, string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+    signature = hmac.digest(signing_key, string_to_sign.encode("utf-8"), "sha256").hex()
 
     # Create authorization header
     authorization_header = (
-        f"{algorithm} Credential={access_key}/{credential_scope}, "
-        f"SignedHeaders={signed_headers}, Signature={signature}"
+        f"{_ALGORITHM} Credential={access_key}/{credential_scope}, "
+        f"SignedHeaders={_SIGNED_HEADERS}, Signature={signature}"
     )
 
     headers = {
@@ -96,17 +140,44 @@ def _make_request(
     }
 
     try:
-        resp = requests.get(
+        resp = get_session().get(
             f"{endpoint}?{canonical_querystring}",
             headers=headers,
             timeout=15,
+            stream=True,
         )
+    except requests.RequestException as e:
+        raise AWSAPIError(f"API request failed: {e}")
+    try:
         resp.raise_for_status()
-
-        # Parse XML response (simple extraction)
-        return {"raw": resp.text}
     except requests.RequestException as e:
+        # Streamed, so the body was never read; release the pooled connection
+        resp.close()
         raise AWSAPIError(f"API request failed: {e}")
+    resp.raw.decode_content = True
+    return resp
+
+
+def _iter_items(resp: requests.Response, field: str) -> Iterator[ET.Element]:
+    """Stream the <item> elements of an EC2 response that contain field.
+
+    EC2 nests <item> lists inside items, so only those with the given child
+    are yielded. Elements are cleared once consumed, keeping memory flat.
+    """
+    try:
+        for _, elem in ET.iterparse(resp.raw):
+            # Tags carry the EC2 namespace, e.g. "{http://ec2...}item"
+            if elem.tag.rpartition("}")[2] != "item":
+                continue
+            if elem.find(f"{{*}}{field}") is not None:
+                yield elem
+                elem.clear()
+    except (ET.ParseError, requests.RequestException, URLLib3Error) as e:
+        # Reading resp.raw directly, so a dropped connection surfaces as
+        # urllib3's own errors rather than requests'
+        raise AWSAPIError(f"Invalid API response: {e}")
+    finally:
+        resp.close()
 
 
 def get_regions(access_key: str, secret_key: str) -> list[dict]:
@@ -114,14 +185,11 @@ def get_regions(access_key: str, secret_key: str) -> list[dict]:
 
     Returns list of dicts with keys: name, endpoint
     """
-    data = _make_request(access_key, secret_key, "us-east-1", "DescribeRegions")
-    raw = data.get("raw", "")
+    resp = _make_request(access_key, secret_key, "us-east-1", "DescribeRegions")
 
-    # Simple XML parsing for regions
     regions = []
-    import re
-    for match in re.finditer(r"<regionName>([^<]+)</regionName>", raw):
-        region_name = match.group(1)
+    for item in _iter_items(resp, "regionName"):
+        region_name = item.findtext("{*}regionName")
         regions.append({
             "name": region_name,
             "display": _get_region_display(region_name),
@@ -134,25 +202,7 @@ def get_regions(access_key: str, secret_key: str) -> list[dict]:
 
 def _get_region_display(region: str) -> str:
     """Get human-readable region name."""
-    region_names = {
-        "us-east-1": "US East (N. Virginia)",
-        "us-east-2": "US East (Ohio)",
-        "us-west-1": "US West (N. California)",
-        "us-west-2": "US West (Oregon)",
-        "eu-west-1": "Europe (Ireland)",
-        "eu-west-2": "Europe (London)",
-        "eu-west-3": "Europe (Paris)",
-        "eu-central-1": "Europe (Frankfurt)",
-        "eu-north-1": "Europe (Stockholm)",
-        "ap-northeast-1": "Asia Pacific (Tokyo)",
-        "ap-northeast-2": "Asia Pacific (Seoul)",
-        "ap-southeast-1": "Asia Pacific (Singapore)",
-        "ap-southeast-2": "Asia Pacific (Sydney)",
-        "ap-south-1": "Asia Pacific (Mumbai)",
-        "sa-east-1": "South America (São Paulo)",
-        "ca-central-1": "Canada (Central)",
-    }
-    return region_names.get(region, region)
+    return _REGION_NAMES.get(region, region)
 
 
 def get_instance_types(access_key: str, secret_key: str, region: str) -> list[dict]:
@@ -168,36 +218,26 @@ def get_instance_types(access_key: str, secret_key: str, region: str) -> list[di
         filters[f"Filter.{i+1}.Name"] = "instance-type"
         filters[f"Filter.{i+1}.Value.1"] = f"{family}.*"
 
-    try:
-        data = _make_request(access_key, secret_key, region, "DescribeInstanceTypes", filters)
-    except AWSAPIError:
-        # Fallback to hardcoded list if API fails
-        return _get_fallback_types()
-
-    raw = data.get("raw", "")
-
-    # Parse XML response
-    import re
     types = []
-
-    # Find all instance type blocks
-    for block in re.finditer(r"<item>(.*?)</item>", raw, re.DOTALL):
-        content = block.group(1)
-
-        type_match = re.search(r"<instanceType>([^<]+)</instanceType>", content)
-        vcpu_match = re.search(r"<DefaultVCpus>(\d+)</DefaultVCpus>", content)
-        mem_match = re.search(r"<SizeInMiB>(\d+)</SizeInMiB>", content)
-
-        if type_match and vcpu_match and mem_match:
-            instance_type = type_match.group(1)
+    try:
+        resp = _make_request(access_key, secret_key, region, "DescribeInstanceTypes", filters)
+        for item in _iter_items(resp, "instanceType"):
+            instance_type = item.findtext("{*}instanceType")
+            vcpus = item.findtext("{*}vCpuInfo/{*}defaultVCpus")
+            memory = item.findtext("{*}memoryInfo/{*}sizeInMiB")
+            if not vcpus or not memory:
+                continue
             # Only include types from our common families
             family = instance_type.split(".")[0]
-            if family in COMMON_FAMILIES:
+            if family in _FAMILY_SET:
                 types.append({
                     "name": instance_type,
-                    "vcpus": int(vcpu_match.group(1)),
-                    "memory": int(mem_match.group(1)) // 1024,  # Convert to GB
+                    "vcpus": int(vcpus),
+                    "memory": int(memory) // 1024,  # Convert to GB
                 })
+    except AWSAPIError:
+        # Fallback to hardcoded list if API fails
+        return _get_fallback_types()
 
     if not types:
         return _get_fallback_types()
@@ -207,8 +247,7 @@ def get_instance_types(access_key: str, secret_key: str, region: str) -> list[di
         parts = t["name"].split(".")
         family = parts[0]
         size = parts[1] if len(parts) > 1 else ""
-        size_order = {"nano": 0, "micro": 1, "small": 2, "medium": 3, "large": 4, "xlarge": 5, "2xlarge": 6}
-        return (COMMON_FAMILIES.index(family) if family in COMMON_FAMILIES else 99, size_order.get(size, 10))
+        return (_FAMILY_INDEX.get(family, 99), _SIZE_ORDER.get(size, 10))
 
     types.sort(key=sort_key)
     return types
@@ -1,8 +1,11 @@
 """DigitalOcean API client."""
 
+import orjson
 import requests
 from typing import Optional
 
+from ._http import get_session
+
 API_BASE = "https://api.digitalocean.com/v2"
 
 
@@ -15,10 +18,10 @@ def _request(token: str, endpoint: str) -> dict:
     """Make authenticated request to DigitalOcean API."""
     headers = {"Authorization": f"Bearer {token}"}
     try:
-        resp = requests.get(f"{API_BASE}{endpoint}", headers=headers, timeout=10)
+        resp = get_session().get(f"{API_BASE}{endpoint}", headers=headers, timeout=10)
         resp.raise_for_status()
-        return resp.json()
-    except requests.RequestException as e:
+        return orjson.loads(resp.content)
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
         raise DigitalOceanAPIError(f"API request failed: {e}")
 
 
@@ -43,19 +46,27 @@ def get_regions(token: str) -> list[dict]:
     return regions
 
 
-def get_sizes(token: str, region: Optional[str] = None) -> list[dict]:
-    """Fetch available droplet sizes.
+def fetch_sizes(token: str) -> list[dict]:
+    """Fetch the raw droplet size catalog (for every region).
+
+    Use filter_sizes() to turn it into the list get_sizes() returns; the two
+    halves let callers fetch before a region is chosen.
+    """
+    return _request(token, "/sizes").get("sizes", [])
+
+
+def filter_sizes(raw: list[dict], region: Optional[str] = None) -> list[dict]:
+    """Select and summarize droplet sizes from a fetch_sizes() catalog.
 
     Args:
-        token: DigitalOcean API token
+        raw: Sizes as returned by the API
         region: Optional region slug to filter by availability
 
     Returns list of dicts with keys: slug, vcpus, memory, disk, price_monthly
     """
-    data = _request(token, "/sizes")
     sizes = []
 
-    for size in data.get("sizes", []):
+    for size in raw:
         if not size.get("available", False):
             continue
 
@@ -77,6 +88,18 @@ def get_sizes(token: str, region: Optional[str] = None) -> list[dict]:
     return sizes
 
 
+def get_sizes(token: str, region: Optional[str] = None) -> list[dict]:
+    """Fetch available droplet sizes.
+
+    Args:
+        token: DigitalOcean API token
+        region: Optional region slug to filter by availability
+
+    Returns list of dicts with keys: slug, vcpus, memory, disk, price_monthly
+    """
+    return filter_sizes(fetch_sizes(token), region)
+
+
 def format_region(region: dict) -> str:
     """Format region for display."""
     return f"{region['name']} ({region['slug']})"
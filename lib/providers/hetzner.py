@@ -1,8 +1,11 @@
 """Hetzner Cloud API client."""
 
+import orjson
 import requests
 from typing import Optional
 
+from ._http import get_session
+
 API_BASE = "https://api.hetzner.cloud/v1"
 
 
@@ -15,10 +18,10 @@ def _request(token: str, endpoint: str) -> dict:
     """Make authenticated request to Hetzner API."""
     headers = {"Authorization": f"Bearer {token}"}
     try:
-        resp = requests.get(f"{API_BASE}{endpoint}", headers=headers, timeout=10)
+        resp = get_session().get(f"{API_BASE}{endpoint}", headers=headers, timeout=10)
         resp.raise_for_status()
-        return resp.json()
-    except requests.RequestException as e:
+        return orjson.loads(resp.content)
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
         raise HetznerAPIError(f"API request failed: {e}")
 
 
@@ -28,52 +31,55 @@ def get_locations(token: str) -> list[dict]:
     Returns list of dicts with keys: name, city, country, description
     """
     data = _request(token, "/locations")
-    locations = []
+    # Sort: EU first, then US, then the rest (in API order)
+    eu_locs, us_locs, other = [], [], []
     for loc in data.get("locations", []):
-        locations.append({
+        country = loc["country"]
+        group = eu_locs if country in ("DE", "FI") else us_locs if country == "US" else other
+        group.append({
             "name": loc["name"],
             "city": loc["city"],
-            "country": loc["country"],
+            "country": country,
             "description": loc["description"],
         })
-    # Sort: EU first, then US
-    eu_locs = [l for l in locations if l["country"] in ("DE", "FI")]
-    us_locs = [l for l in locations if l["country"] == "US"]
-    other = [l for l in locations if l not in eu_locs and l not in us_locs]
     return eu_locs + us_locs + other
 
 
-def get_server_types(token: str, location: Optional[str] = None) -> list[dict]:
-    """Fetch available server types.
+def fetch_server_types(token: str) -> list[dict]:
+    """Fetch the raw server type catalog (for every location).
+
+    Use filter_server_types() to turn it into the list get_server_types()
+    returns; the two halves let callers fetch before a location is chosen.
+    """
+    return _request(token, "/server_types").get("server_types", [])
+
+
+def filter_server_types(raw: list[dict], location: Optional[str] = None) -> list[dict]:
+    """Select and summarize server types from a fetch_server_types() catalog.
 
     Args:
-        token: Hetzner API token
+        raw: Server types as returned by the API
         location: Optional location name to filter by availability
 
     Returns list of dicts with keys: name, cores, memory, disk, price_monthly
     """
-    data = _request(token, "/server_types")
     server_types = []
 
-    for st in data.get("server_types", []):
+    for st in raw:
         # Skip deprecated types
         if st.get("deprecation"):
             continue
 
-        # Check location availability if specified
-        if location:
-            available_in = [p["location"] for p in st.get("prices", [])]
-            if location not in available_in:
-                continue
-
-        # Get monthly price for the location (or first available)
-        price_monthly = None
-        for price in st.get("prices", []):
-            if location and price["location"] == location:
-                price_monthly = float(price["price_monthly"]["gross"])
-                break
-            elif not location and price_monthly is None:
-                price_monthly = float(price["price_monthly"]["gross"])
+        # Monthly price per location; a type is only offered where it's priced
+        prices = {
+            p["location"]: float(p["price_monthly"]["gross"])
+            for p in st.get("prices", [])
+        }
+        if location and location not in prices:
+            continue
+
+        # Price for the location (or first available)
+        price_monthly = prices[location] if location else next(iter(prices.values()), None)
 
         server_types.append({
             "name": st["name"],
@@ -90,6 +96,18 @@ def get_server_types(token: str, location: Optional[str] = None) -> list[dict]:
     return server_types
 
 
+def get_server_types(token: str, location: Optional[str] = None) -> list[dict]:
+    """Fetch available server types.
+
+    Args:
+        token: Hetzner API token
+        location: Optional location name to filter by availability
+
+    Returns list of dicts with keys: name, cores, memory, disk, price_monthly
+    """
+    return filter_server_types(fetch_server_types(token), location)
+
+
 def format_location(loc: dict) -> str:
     """Format location for display."""
     region = "EU" if loc["country"] in ("DE", "FI") else "US"
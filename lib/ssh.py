@@ -1,85 +1,171 @@
 """SSH helper functions."""
 
+import asyncio
 import os
+import shlex
+import shutil
 import subprocess
 import socket
-import time
-from typing import Optional
+import struct
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
 
 from .config import get_deployment_ip, get_private_key_path
 
+# struct linger {l_onoff=1, l_linger=0}: close() resets instead of lingering
+_LINGER_RESET = struct.pack("ii", 1, 0)
+
+# Where ssh-keygen -R removes host keys from
+_KNOWN_HOSTS = Path.home() / ".ssh" / "known_hosts"
+
+
+@lru_cache(maxsize=1)
+def find_ssh_cmd() -> Optional[str]:
+    """Find the ssh client, resolved once per process."""
+    return shutil.which("ssh")
+
+
+def _may_know_host(host: str) -> bool:
+    """Check whether known_hosts could have an entry for host.
+
+    A plain substring scan, which also matches "[host]:port" entries.
+    Hashed entries (HashKnownHosts) can't be searched, so their presence
+    means ssh-keygen has to look.
+    """
+    try:
+        known = _KNOWN_HOSTS.read_bytes()
+    except OSError:
+        return False
+    return b"|1|" in known or host.encode() in known
+
 
 def remove_host_key(host: str) -> None:
     """Remove existing SSH host key for an IP (handles IP reuse)."""
+    if not _may_know_host(host):
+        return
     subprocess.run(
         ["ssh-keygen", "-R", host],
         capture_output=True,  # Suppress output
     )
 
 
-def is_reachable(host: str, port: int = 22, timeout: int = 5) -> bool:
-    """Quick check if SSH port is reachable."""
+def is_port_open(host: str, port: int = 22, timeout: float = 3.0) -> bool:
+    """Check whether a TCP connection to host:port can be opened.
+
+    The probe socket is closed with an RST (SO_LINGER 0) rather than a FIN,
+    so repeated polling doesn't pile up sockets in TIME_WAIT.
+    """
     try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(timeout)
-        result = sock.connect_ex((host, port))
-        sock.close()
-        return result == 0
-    except (socket.error, OSError):
+        with socket.create_connection((host, port), timeout=timeout) as sock:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, _LINGER_RESET)
+            return True
+    except OSError:
         return False
 
 
+async def remove_host_key_async(host: str) -> None:
+    """Async variant of remove_host_key."""
+    if not _may_know_host(host):
+        return
+    process = await asyncio.create_subprocess_exec(
+        "ssh-keygen",
+        "-R",
+        host,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    await process.wait()
+
+
+async def _wait_for_port(host: str, port: int, timeout: int) -> bool:
+    """Poll until a TCP connection to host:port succeeds or timeout expires.
+
+    Retries back off from half a second up to five, so a port that opens
+    soon after boot is noticed quickly without hammering a slow host.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    delay = 0.5
+    while loop.time() < deadline:
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port), timeout=5
+            )
+        except (OSError, asyncio.TimeoutError):
+            await asyncio.sleep(min(delay, max(deadline - loop.time(), 0)))
+            delay = min(delay * 2, 5)
+            continue
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
+    return False
+
+
+async def wait_for_ssh_async(host: str, port: int = 22, timeout: int = 150) -> bool:
+    """Wait for SSH to become available.
+
+    Removing any stale host key (handles IP reuse common on Hetzner) runs
+    concurrently with the port polling instead of delaying the first probe.
+    """
+    _, reachable = await asyncio.gather(
+        remove_host_key_async(host),
+        _wait_for_port(host, port, timeout),
+    )
+    return reachable
+
+
 def wait_for_ssh(host: str, port: int = 22, timeout: int = 150) -> bool:
     """Wait for SSH to become available."""
-    # Remove any existing host key (handles IP reuse common on Hetzner)
-    remove_host_key(host)
-
-    start = time.time()
-    while time.time() - start < timeout:
-        if is_reachable(host, port, timeout=5):
-            return True
-        time.sleep(5)
-    return False
+    return asyncio.run(wait_for_ssh_async(host, port, timeout))
 
 
-def connect(name: str, user: str = None) -> bool:
-    """SSH to a deployment."""
+def get_ssh_argv(name: str, user: str = None) -> Optional[List[str]]:
+    """Get the ssh argv for a deployment, or None if it has no IP."""
     ip = get_deployment_ip(name)
     if not ip:
-        return False
-
-    key_path = get_private_key_path(name)
-    if not key_path:
-        return False
+        return None
 
     # Default to roughneck user (created by ansible during deployment)
     if user is None:
         user = "roughneck"
 
     args = ["ssh"]
+    key_path = get_private_key_path(name)
     if key_path:
         args.extend(["-i", key_path])
     args.extend(["-o", "StrictHostKeyChecking=accept-new"])
     args.append(f"{user}@{ip}")
+    return args
+
+
+def connect(name: str, user: str = None) -> bool:
+    """SSH to a deployment."""
+    if not get_private_key_path(name):
+        return False
+
+    args = get_ssh_argv(name, user)
+    if not args:
+        return False
+
+    ssh_cmd = find_ssh_cmd()
+    if not ssh_cmd:
+        return False
 
     # Show the command being run
-    print(f"Running: {' '.join(args)}")
+    print(f"Running: {shlex.join(args)}", flush=True)
 
     # Replace current process with ssh
-    os.execvp("ssh", args)
+    os.execve(ssh_cmd, args, os.environ)
     return True  # Never reached
 
 
 def get_ssh_command(name: str, user: str = None) -> Optional[str]:
-    """Get the SSH command for a deployment."""
-    ip = get_deployment_ip(name)
-    if not ip:
+    """Get the SSH command for a deployment, quoted for a shell."""
+    args = get_ssh_argv(name, user)
+    if not args:
         return None
-
-    if user is None:
-        user = "roughneck"
-
-    key_path = get_private_key_path(name)
-    if key_path:
-        return f"ssh -i {key_path} {user}@{ip}"
-    return f"ssh {user}@{ip}"
+    return shlex.join(args)
@@ -1,105 +1,223 @@
 """Terraform/OpenTofu wrapper."""
 
+import hashlib
 import os
-import re
 import shutil
+import signal
 import subprocess
 import sys
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from queue import SimpleQueue
+from typing import Dict, List, Optional, Tuple
 
-from .config import get_root_dir, get_deployment_dir
+import orjson
+
+from .config import file_stamp, get_root_dir, get_deployment_dir
+
+# Pipe buffer requested for apply output (the Linux default is 64 KiB)
+_PIPE_SIZE = 1 << 20
+
+# Written to the deployment dir after a successful init, see _ensure_init()
+_INIT_HASH_FILE = ".tf_init_hash"
+
+# Parsed tfvars by resolved path, with the config.file_stamp() they were
+# read at; a single operation parses the same file several times.
+_tfvars_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, str]]] = {}
+
+# Parsed `output -json` by state path, with the stamp of the state it came from
+_outputs_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, dict]]] = {}
 
 
 def parse_tfvars(path: Path) -> dict:
-    """Parse a terraform.tfvars file into a dict."""
-    result = {}
-    if not path.exists():
-        return result
+    """Parse a terraform.tfvars file into a dict.
 
-    content = path.read_text()
-    # Match: key = "value" or key = value
-    for match in re.finditer(r'^(\w+)\s*=\s*"([^"]*)"', content, re.MULTILINE):
-        result[match.group(1)] = match.group(2)
+    Results are cached until the file changes; don't modify them.
+    """
+    stamp = file_stamp(path)
+    if stamp is None:
+        return {}
+
+    key = str(path.resolve())
+    cached = _tfvars_cache.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
 
+    result = _parse_tfvars_text(path.read_text())
+    _tfvars_cache[key] = (stamp, result)
     return result
 
 
-def get_provider_env(name: str) -> dict:
-    """Get environment variables for the selected provider's credentials."""
-    deploy_dir = get_deployment_dir(name)
-    tfvars = parse_tfvars(deploy_dir / "terraform.tfvars")
+def _parse_tfvars_text(content: str) -> Dict[str, str]:
+    """Parse top-level scalar assignments in one pass over the lines.
+
+    Handles key = "string", key = true/false and key = number; values are
+    returned as strings. Comments, lists, maps and indented (nested) lines
+    are skipped.
+    """
+    result = {}
+    for line in content.splitlines():
+        if not line or line[0] in " \t#/":
+            continue
+        key, sep, value = line.partition("=")
+        key = key.rstrip()
+        if not sep or not key.isidentifier():
+            continue
+        value = value.strip()
+        if value.startswith('"'):
+            end = value.find('"', 1)
+            if end > 0:
+                result[key] = value[1:end]
+        elif value:
+            token = value.split(None, 1)[0]
+            if token in ("true", "false") or token.replace(".", "", 1).isdigit():
+                result[key] = token
+    return result
+
+
+# Credential tfvars exported to terraform's provider plugins, per provider
+_PROVIDER_ENV_VARS = {
+    "hetzner": (("hetzner_token", "HCLOUD_TOKEN"),),
+    "aws": (
+        ("aws_access_key", "AWS_ACCESS_KEY_ID"),
+        ("aws_secret_key", "AWS_SECRET_ACCESS_KEY"),
+    ),
+    "digitalocean": (("digitalocean_token", "DIGITALOCEAN_TOKEN"),),
+}
+
+
+def _load_tfvars(name: str) -> dict:
+    """Parse a deployment's terraform.tfvars (once per operation)."""
+    return parse_tfvars(get_deployment_dir(name) / "terraform.tfvars")
 
+
+def get_provider_env(tfvars: dict) -> Optional[dict]:
+    """Get the environment for terraform, with the provider's credentials.
+
+    Args:
+        tfvars: The deployment's parsed tfvars, see _load_tfvars()
+
+    Returns None when there is nothing to add, so the child simply inherits
+    this process's environment instead of getting a copy of it.
+    """
     provider = tfvars.get("provider_name", "")
-    env = os.environ.copy()
-
-    if provider == "hetzner":
-        token = tfvars.get("hetzner_token", "")
-        if token:
-            env["HCLOUD_TOKEN"] = token
-    elif provider == "aws":
-        access_key = tfvars.get("aws_access_key", "")
-        secret_key = tfvars.get("aws_secret_key", "")
-        if access_key:
-            env["AWS_ACCESS_KEY_ID"] = access_key
-        if secret_key:
-            env["AWS_SECRET_ACCESS_KEY"] = secret_key
-    elif provider == "digitalocean":
-        token = tfvars.get("digitalocean_token", "")
-        if token:
-            env["DIGITALOCEAN_TOKEN"] = token
-
-    return env
+    extra = {
+        env_var: value
+        for tfvar, env_var in _PROVIDER_ENV_VARS.get(provider, ())
+        if (value := tfvars.get(tfvar))
+    }
+    if not extra:
+        return None
+    return {**os.environ, **extra}
 
 
+@lru_cache(maxsize=1)
 def find_terraform_cmd() -> Optional[str]:
-    """Find tofu or terraform command."""
-    if shutil.which("tofu"):
-        return "tofu"
-    if shutil.which("terraform"):
-        return "terraform"
-    return None
+    """Find tofu or terraform command.
+
+    Returns the resolved path so each run execs it without another PATH search.
+    """
+    return shutil.which("tofu") or shutil.which("terraform")
 
 
+@lru_cache(maxsize=None)
 def get_terraform_dir() -> Path:
     """Get the base terraform directory."""
     return get_root_dir() / "terraform"
 
 
+@lru_cache(maxsize=None)
 def get_provider_dir(provider: str) -> Path:
     """Get the shared terraform directory for a specific provider."""
     return get_terraform_dir() / "providers" / provider
 
 
+# Isolated provider dirs already found on disk. Only hits are remembered: a
+# deployment's copy of terraform never goes away while it exists, but one
+# may be created for a deployment that was using the shared dir.
+_isolated_dirs: Dict[Tuple[str, str], Path] = {}
+
+
 def get_deployment_provider_dir(name: str, provider: str) -> Path:
     """Get terraform provider dir for a deployment (isolated or shared).
 
     New deployments have terraform copied into their directory.
     Old deployments fall back to the shared terraform directory.
     """
-    deploy_dir = get_deployment_dir(name)
-    isolated = deploy_dir / "terraform" / "providers" / provider
+    isolated = _isolated_dirs.get((name, provider))
+    if isolated is not None:
+        return isolated
+
+    isolated = get_deployment_dir(name) / "terraform" / "providers" / provider
     if isolated.exists():
+        _isolated_dirs[(name, provider)] = isolated
         return isolated
     # Fallback to shared (for old deployments)
     return get_provider_dir(provider)
 
 
+def _sources_hash(cmd: str, tf_dir: Path) -> str:
+    """Hash what init depends on: the binary, provider dir, modules and lock file.
+
+    The provider dir's path is included, so switching provider (or moving
+    from the shared to an isolated copy) also changes the hash. The binary
+    is identified by its resolved path and file_stamp(), which tells tofu
+    from terraform and catches upgrades without reading the binary.
+    """
+    root = tf_dir.parent.parent
+    digest = hashlib.blake2b(str(tf_dir).encode(), digest_size=16)
+    digest.update(f"\0{cmd}\0{file_stamp(Path(cmd))}\0".encode())
+    try:
+        digest.update((tf_dir / ".terraform.lock.hcl").read_bytes())
+    except OSError:
+        pass
+    digest.update(b"\0")
+    for path in sorted(root.rglob("*.tf")):
+        if ".terraform" in path.parts:
+            continue
+        digest.update(path.relative_to(root).as_posix().encode())
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _ensure_init(cmd: str, name: str, tf_dir: Path) -> bool:
+    """Run terraform init unless it already ran against the same sources.
+
+    The hash of the sources is recorded in the deployment dir after a
+    successful init; init is skipped while it still matches and the
+    provider dir still has its .terraform directory.
+    """
+    hash_path = get_deployment_dir(name) / _INIT_HASH_FILE
+    current = _sources_hash(cmd, tf_dir)
+    if (tf_dir / ".terraform").is_dir():
+        try:
+            if hash_path.read_text() == current:
+                return True
+        except OSError:
+            pass
+
+    result = subprocess.run([cmd, "init"], cwd=tf_dir)
+    if result.returncode != 0:
+        return False
+    try:
+        # Hashed again, as init may have written or updated the lock file
+        hash_path.write_text(_sources_hash(cmd, tf_dir))
+    except OSError:
+        pass
+    return True
+
+
 def init(name: str) -> bool:
-    """Run terraform init for a deployment."""
+    """Run terraform init for a deployment (skipped if sources are unchanged)."""
     cmd = find_terraform_cmd()
     if not cmd:
         return False
 
-    deploy_dir = get_deployment_dir(name)
-    tfvars = parse_tfvars(deploy_dir / "terraform.tfvars")
-    provider = tfvars.get("provider_name", "hetzner")
-
-    result = subprocess.run(
-        [cmd, "init"],
-        cwd=get_deployment_provider_dir(name, provider),
-    )
-    return result.returncode == 0
+    provider = _load_tfvars(name).get("provider_name", "hetzner")
+    return _ensure_init(cmd, name, get_deployment_provider_dir(name, provider))
 
 
 class ApplyResult:
@@ -113,6 +231,54 @@ class ApplyResult:
         return self.success
 
 
+def _run_args(
+    cmd: str, action: str, name: str, tfvars: dict
+) -> Tuple[List[str], Path]:
+    """Get the argv and working directory for terraform apply or destroy."""
+    deploy_dir = get_deployment_dir(name)
+    tfvars_path = deploy_dir / "terraform.tfvars"
+    state_path = deploy_dir / "terraform.tfstate"
+    provider = tfvars.get("provider_name", "hetzner")
+
+    argv = [
+        cmd,
+        action,
+        "-auto-approve",
+        f"-var-file={tfvars_path}",
+        f"-var=deployment_dir={deploy_dir}",
+        f"-state={state_path}",
+    ]
+    return argv, get_deployment_provider_dir(name, provider)
+
+
+def _grow_pipe(fd: int) -> None:
+    """Enlarge a pipe's kernel buffer to _PIPE_SIZE (Linux only, best effort)."""
+    try:
+        import fcntl
+
+        fcntl.fcntl(fd, fcntl.F_SETPIPE_SZ, _PIPE_SIZE)
+    except (ImportError, AttributeError, OSError):
+        pass
+
+
+def _signal_group(process: subprocess.Popen, sig: int) -> None:
+    """Signal a child started with start_new_session, if it's still around."""
+    try:
+        os.killpg(process.pid, sig)
+    except ProcessLookupError:
+        pass
+
+
+def _drain(fd: int, chunks: SimpleQueue) -> None:
+    """Read fd to EOF in pipe-sized chunks, then queue None."""
+    try:
+        while chunk := os.read(fd, _PIPE_SIZE):
+            chunks.put(chunk)
+    finally:
+        # Even if a read fails, so apply() never waits on the queue forever
+        chunks.put(None)
+
+
 def apply(name: str) -> ApplyResult:
     """Run terraform apply for a deployment.
 
@@ -122,37 +288,75 @@ def apply(name: str) -> ApplyResult:
     if not cmd:
         return ApplyResult(False, "Terraform/tofu not found")
 
-    deploy_dir = get_deployment_dir(name)
-    tfvars_path = deploy_dir / "terraform.tfvars"
-    state_path = deploy_dir / "terraform.tfstate"
-    tfvars = parse_tfvars(tfvars_path)
-    provider = tfvars.get("provider_name", "hetzner")
+    tfvars = _load_tfvars(name)
+    argv, cwd = _run_args(cmd, "apply", name, tfvars)
+
+    # Stream output while capturing it. A reader thread keeps the pipe
+    # drained so a slow terminal never stalls terraform on a full pipe.
+    # Everything that can fail on our side happens before terraform starts.
+    sys.stdout.flush()
+    out = sys.stdout.buffer
+    captured = bytearray()
+    pending: SimpleQueue = SimpleQueue()
 
     # Use Popen to stream output while capturing for error detection
     process = subprocess.Popen(
-        [
-            cmd,
-            "apply",
-            "-auto-approve",
-            f"-var-file={tfvars_path}",
-            f"-var=deployment_dir={deploy_dir}",
-            f"-state={state_path}",
-        ],
-        cwd=get_deployment_provider_dir(name, provider),
-        env=get_provider_env(name),
+        argv,
+        cwd=cwd,
+        env=get_provider_env(tfvars),
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,  # Merge stderr into stdout
-        text=True,
+        bufsize=0,
+        # Own process group: Ctrl-C is forwarded below, exactly once
+        start_new_session=True,
     )
-
-    # Stream output while capturing it
-    output_lines = []
-    for line in process.stdout:
-        print(line, end="")  # Stream to terminal
-        output_lines.append(line)
-
-    process.wait()
-    full_output = "".join(output_lines)
+    reader: Optional[threading.Thread] = None
+    interrupted = False
+    eof = False
+    try:
+        _grow_pipe(process.stdout.fileno())
+        reader = threading.Thread(
+            target=_drain, args=(process.stdout.fileno(), pending), daemon=True
+        )
+        reader.start()
+        while True:
+            try:
+                while not eof:
+                    if (chunk := pending.get()) is None:
+                        eof = True
+                        break
+                    # Stream to terminal; buffer.write() retries short writes
+                    out.write(chunk)
+                    out.flush()
+                    captured += chunk
+                reader.join()
+                process.stdout.close()
+                process.wait()
+                break
+            except KeyboardInterrupt:
+                # Interrupt terraform's process group as the terminal would
+                # and keep showing its output while it stops and saves state
+                if interrupted:
+                    raise
+                interrupted = True
+                _signal_group(process, signal.SIGINT)
+    except BaseException as e:
+        if interrupted and isinstance(e, KeyboardInterrupt):
+            # Second Ctrl-C: kill it, as terraform itself does
+            _signal_group(process, signal.SIGKILL)
+            process.wait()
+            reader.join(1)
+        elif not interrupted:
+            # Terraform is in its own session, so nothing else will stop it
+            # (e.g. EPIPE writing to a closed pager)
+            _signal_group(process, signal.SIGINT)
+        # A running reader keeps the pipe and exits at EOF
+        if reader is None or not reader.is_alive():
+            process.stdout.close()
+        raise
+    if interrupted:
+        raise KeyboardInterrupt
+    full_output = captured.decode("utf-8", "replace")
 
     if process.returncode == 0:
         return ApplyResult(True)
@@ -166,59 +370,63 @@ def destroy(name: str) -> bool:
     if not cmd:
         return False
 
-    deploy_dir = get_deployment_dir(name)
-    tfvars_path = deploy_dir / "terraform.tfvars"
-    state_path = deploy_dir / "terraform.tfstate"
-    tfvars = parse_tfvars(tfvars_path)
-    provider = tfvars.get("provider_name", "hetzner")
-    tf_dir = get_deployment_provider_dir(name, provider)
-
-    if not state_path.exists():
+    if not (get_deployment_dir(name) / "terraform.tfstate").exists():
         return True  # Nothing to destroy
 
+    tfvars = _load_tfvars(name)
+    argv, tf_dir = _run_args(cmd, "destroy", name, tfvars)
+
     # Ensure modules are initialized (may have been cleared by other provider deploys)
-    init_result = subprocess.run(
-        [cmd, "init"],
-        cwd=tf_dir,
-    )
-    if init_result.returncode != 0:
+    if not _ensure_init(cmd, name, tf_dir):
         return False
 
-    result = subprocess.run(
-        [
-            cmd,
-            "destroy",
-            "-auto-approve",
-            f"-var-file={tfvars_path}",
-            f"-var=deployment_dir={deploy_dir}",
-            f"-state={state_path}",
-        ],
-        cwd=tf_dir,
-        env=get_provider_env(name),
-    )
+    result = subprocess.run(argv, cwd=tf_dir, env=get_provider_env(tfvars))
     return result.returncode == 0
 
 
-def output(name: str, key: str) -> Optional[str]:
-    """Get a terraform output value."""
+def _load_outputs(name: str) -> Dict[str, dict]:
+    """Get all terraform outputs for a deployment, as from `output -json`.
+
+    One subprocess serves every key; the result is cached until the state
+    file changes.
+    """
     cmd = find_terraform_cmd()
     if not cmd:
-        return None
+        return {}
 
-    deploy_dir = get_deployment_dir(name)
-    state_path = deploy_dir / "terraform.tfstate"
-    if not state_path.exists():
-        return None
+    state_path = get_deployment_dir(name) / "terraform.tfstate"
+    stamp = file_stamp(state_path)
+    if stamp is None:
+        return {}
 
-    tfvars = parse_tfvars(deploy_dir / "terraform.tfvars")
-    provider = tfvars.get("provider_name", "hetzner")
+    key = str(state_path)
+    cached = _outputs_cache.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
 
+    provider = _load_tfvars(name).get("provider_name", "hetzner")
     result = subprocess.run(
-        [cmd, "output", "-raw", f"-state={state_path}", key],
+        [cmd, "output", "-json", f"-state={state_path}"],
         cwd=get_deployment_provider_dir(name, provider),
         capture_output=True,
-        text=True,
     )
-    if result.returncode == 0:
-        return result.stdout.strip()
+    if result.returncode != 0:
+        return {}
+    try:
+        outputs = orjson.loads(result.stdout)
+    except orjson.JSONDecodeError:
+        return {}
+
+    _outputs_cache[key] = (stamp, outputs)
+    return outputs
+
+
+def output(name: str, key: str) -> Optional[str]:
+    """Get a terraform output value, formatted as `output -raw` would."""
+    value = _load_outputs(name).get(key, {}).get("value")
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (str, int, float)):
+        return str(value)
+    # Missing, null, or a list/map (which -raw refuses to print)
     return None